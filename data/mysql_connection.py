@@ -19,6 +19,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Use the C extension for protocol handling when it loaded; use_pure=False raises without it
+CEXT_OPTIONS = {'use_pure': False} if getattr(mysql.connector, 'HAVE_CEXT', False) else {}
+
 class MySQLConnection:
     """
     MySQL Connection Manager with connection pooling and fallback mechanisms.
@@ -71,6 +74,7 @@ class MySQLConnection:
                 'collation': 'utf8mb4_unicode_ci',
                 'autocommit': True,
                 'connect_timeout': 10,
+                **CEXT_OPTIONS,
             }
             
             if not self.use_ssl:
@@ -149,6 +153,7 @@ class MySQLConnection:
                 'charset': 'utf8mb4',
                 'collation': 'utf8mb4_unicode_ci',
                 'connect_timeout': 10,
+                **CEXT_OPTIONS,
             }
             
             if not self.use_ssl:
@@ -2,16 +2,18 @@
 Fixed Database Setup Script with privilege handling
 """
 import mysql.connector
+from mysql.connector import pooling
 import sys
 import os
 import logging
+import pickle
+import re
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 import traceback
-
-# Add project root to path
-sys.path.append(str(Path(__file__).parent))
-from data.mysql_connection import MySQLConnection
+from contextlib import closing, contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +22,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Errors expected when re-running the SQL files against an existing schema:
+# 1062 ER_DUP_ENTRY, 1050 ER_TABLE_EXISTS_ERROR, 1146 ER_NO_SUCH_TABLE
+IGNORED_SQL_ERRNOS = frozenset({1062, 1050, 1146})
+
+# Use the C extension for protocol handling when it loaded; use_pure=False raises without it
+CEXT_OPTIONS = {'use_pure': False} if getattr(mysql.connector, 'HAVE_CEXT', False) else {}
+
+# Statements per transaction when executing a SQL file with fast_import
+FAST_IMPORT_COMMIT_INTERVAL = 500
+
+# Consecutive INSERTs sharing this prefix are merged into one multi-row INSERT
+INSERT_VALUES_RE = re.compile(
+    r"^(?!.*\bON\s+DUPLICATE\s+KEY\b)(INSERT\s+(?:IGNORE\s+)?INTO\s+`?\w+`?\s*(?:\([^)]*\))?\s*VALUES)\s*(.+?)\s*;?$",
+    re.IGNORECASE | re.DOTALL
+)
+# Keep merged INSERTs well under the default 4 MB max_allowed_packet
+MAX_INSERT_BATCH_BYTES = 1024 * 1024
+MAX_INSERT_BATCH_STATEMENTS = 1000
+
+# Statement splitting works on whole buffered chunks instead of line by line
+SQL_COMMENT_LINE_RE = re.compile(r"^[ \t]*(?:--|/\*).*(?:\n|$)", re.MULTILINE)
+SQL_STATEMENT_END_RE = re.compile(r";[ \t\r]*$", re.MULTILINE)
+SQL_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+
+# Target table of a data statement, used to group Insert_data.sql for parallel loading
+SQL_TARGET_TABLE_RE = re.compile(
+    r"^(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+# Tables other loaded tables reference by id; they are loaded before everything else
+INSERT_PARENT_TABLES = frozenset({'users', 'error_categories', 'badges'})
+# Connection pool for setup work, sized processors * 2 + 1 and capped at 16
+SETUP_POOL_SIZE = min((os.cpu_count() or 1) * 2 + 1, 16)
+
+# SQL files are streamed through a buffered reader in chunks of this size
+SQL_READ_BUFFER_SIZE = 64 * 1024
+
+# Bump when the statement splitter changes so stale .sql.cache files are re-parsed
+SQL_CACHE_VERSION = 2
+
+# Database and user names are interpolated into DCL, which cannot take identifier parameters
+IDENTIFIER_RE = re.compile(r"^[A-Za-z0-9_]+$")
+
+# Number of static global privileges a user granted ALL PRIVILEGES holds at minimum
+ALL_PRIVILEGES_MIN_COUNT = 28
+
+
+class MergedInsert(str):
+    """
+    A multi-row INSERT built by batch_insert_statements.
+    
+    Keeps the single-row statements it replaced in .statements, so a batch
+    rejected for one duplicate key can be re-run row by row.
+    """
+
+
 class DatabaseSetup:
     """Handle database setup and configuration."""
     
@@ -36,39 +94,104 @@ class DatabaseSetup:
         self.app_user = os.getenv("MYSQL_USER", "java_review_user")
         self.app_password = os.getenv("MYSQL_PASSWORD", "Thomas123!")
         
+        # Cached (has_create_user, has_all_privileges) from check_user_privileges
+        self._priv_cache = None
+        
+        # Connection shared by every setup phase, opened lazily by _get_conn()
+        self._conn = None
+        self._conn_database = None
+        # Pool for parallel loading and verification, created by _get_pool() once the database exists
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
         logger.debug(f"Database setup initialized:")
         logger.debug(f"  Host: {self.db_host}:{self.db_port}")
         logger.debug(f"  Database: {self.db_name}")
         logger.debug(f"  App User: {self.app_user}")
 
-    def check_user_privileges(self):
-        """Check if current user has necessary privileges."""
-        try:
-            connection = mysql.connector.connect(
+    def _get_conn(self):
+        """Return the shared setup connection, reconnecting only if it was lost."""
+        if self._conn is None or not self._conn.is_connected():
+            self._conn = mysql.connector.connect(
                 host=self.db_host,
                 user=self.db_user,
                 password=self.db_password,
-                port=self.db_port
+                port=self.db_port,
+                database=self._conn_database,
+                charset='utf8mb4',
+                collation='utf8mb4_unicode_ci',
+                autocommit=True,
+                **CEXT_OPTIONS,
+                compress=True
             )
+        return self._conn
+
+    def _get_pool(self):
+        """Return the connection pool used for parallel loading and verification, creating it on first use."""
+        if self._pool is not None:
+            return self._pool
+        # Workers may ask for the pool concurrently; build it only once
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name='java_review_setup_pool',
+                    pool_size=SETUP_POOL_SIZE,
+                    host=self.db_host,
+                    user=self.db_user,
+                    password=self.db_password,
+                    port=self.db_port,
+                    database=self.db_name,
+                    charset='utf8mb4',
+                    collation='utf8mb4_unicode_ci',
+                    autocommit=True,
+                    **CEXT_OPTIONS,
+                    compress=True
+                )
+        return self._pool
+
+    def close(self):
+        """Close the shared setup connection and the pooled connections."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing setup connection: {e}")
+            self._conn = None
+        if self._pool is not None:
+            try:
+                # Close the idle pooled connections rather than leaving them to the server timeout
+                self._pool._remove_connections()
+            except Exception as e:
+                logger.debug(f"Error closing setup pool connections: {e}")
+            self._pool = None
+
+    def check_user_privileges(self):
+        """Check if current user has necessary privileges."""
+        if self._priv_cache is not None:
+            return self._priv_cache
+        
+        try:
+            connection = self._get_conn()
             
             cursor = connection.cursor()
-            cursor.execute("SHOW GRANTS FOR CURRENT_USER()")
-            grants = cursor.fetchall()
-            
-            has_create_user = False
-            has_all_privileges = False
-            
-            for grant in grants:
-                grant_text = grant[0].upper()
-                if "CREATE USER" in grant_text or "ALL PRIVILEGES" in grant_text:
-                    has_create_user = True
-                if "ALL PRIVILEGES" in grant_text:
-                    has_all_privileges = True
+            # Let the server evaluate the privilege predicates and return one small row
+            cursor.execute("""
+                SELECT COALESCE(SUM(PRIVILEGE_TYPE IN ('CREATE USER', 'SUPER')), 0),
+                       COUNT(DISTINCT PRIVILEGE_TYPE)
+                FROM information_schema.USER_PRIVILEGES
+                WHERE GRANTEE = CONCAT("'", SUBSTRING_INDEX(CURRENT_USER(), '@', 1),
+                                       "'@'", SUBSTRING_INDEX(CURRENT_USER(), '@', -1), "'")
+            """)
+            create_user_privs, total_privs = cursor.fetchone()
+            
+            has_create_user = create_user_privs > 0
+            # GRANT ALL PRIVILEGES ON *.* expands to every static global privilege
+            has_all_privileges = total_privs >= ALL_PRIVILEGES_MIN_COUNT
             
             cursor.close()
-            connection.close()
             
-            return has_create_user, has_all_privileges
+            self._priv_cache = (has_create_user, has_all_privileges)
+            return self._priv_cache
             
         except Exception as e:
             logger.error(f"Error checking privileges: {e}")
@@ -79,28 +202,14 @@ class DatabaseSetup:
         try:
             logger.debug("Testing database connection...")
             
-            connection = mysql.connector.connect(
-                host=self.db_host,
-                user=self.db_user,
-                password=self.db_password,
-                port=self.db_port,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
-            )
+            connection = self._get_conn()
             
-            if connection.is_connected():
-                db_info = connection.get_server_info()
-                logger.debug(f"Successfully connected to MySQL Server version {db_info}")
-                cursor = connection.cursor()
-                cursor.execute("SELECT DATABASE();")
-                current_db = cursor.fetchone()
-                logger.debug(f"Current database: {current_db}")
-                cursor.close()
-                connection.close()
-                return True
-            else:
-                logger.error("Failed to connect to database")
-                return False
+            # connect() raises on failure, so reaching here means the handshake succeeded;
+            # server info is cached on the connection object, so this costs no round-trip
+            db_info = connection.get_server_info()
+            logger.debug(f"Successfully connected to MySQL Server version {db_info}")
+            logger.debug(f"Current database: {self._conn_database}")
+            return True
                 
         except mysql.connector.Error as e:
             logger.error(f"Database connection error: {str(e)}")
@@ -117,28 +226,21 @@ class DatabaseSetup:
         try:
             logger.debug(f"Creating database '{self.db_name}' if it doesn't exist...")
             
-            connection = mysql.connector.connect(
-                host=self.db_host,
-                user=self.db_user,
-                password=self.db_password,
-                port=self.db_port,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
-            )
+            connection = self._get_conn()
             
             cursor = connection.cursor()
             
-            # Create database
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{self.db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            # Create the database, then switch the shared connection to it
+            cursor.execute(
+                f"CREATE DATABASE IF NOT EXISTS `{self.db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
+            )
+            connection.database = self.db_name
             logger.debug(f"Database '{self.db_name}' created or already exists")
-            
-            # Switch to the database
-            cursor.execute(f"USE `{self.db_name}`")
             logger.debug(f"Switched to database '{self.db_name}'")
+            self._conn_database = self.db_name
             
-            connection.commit()
+            # CREATE DATABASE commits implicitly, no connection.commit() needed
             cursor.close()
-            connection.close()
             
             return True
             
@@ -152,22 +254,13 @@ class DatabaseSetup:
     def check_user_exists(self, username):
         """Check if a user already exists."""
         try:
-            connection = mysql.connector.connect(
-                host=self.db_host,
-                user=self.db_user,
-                password=self.db_password,
-                port=self.db_port,
-                database=self.db_name,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
-            )
+            connection = self._get_conn()
             
             cursor = connection.cursor()
             cursor.execute("SELECT User FROM mysql.user WHERE User = %s", (username,))
             result = cursor.fetchone()
             
             cursor.close()
-            connection.close()
             
             return result is not None
             
@@ -197,21 +290,20 @@ class DatabaseSetup:
             
             logger.debug(f"Creating application user '{self.app_user}'...")
             
-            connection = mysql.connector.connect(
-                host=self.db_host,
-                user=self.db_user,
-                password=self.db_password,
-                port=self.db_port,
-                database=self.db_name,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
-            )
+            if not IDENTIFIER_RE.match(self.db_name) or not IDENTIFIER_RE.match(self.app_user):
+                logger.error("Database and user names may only contain letters, digits and underscores")
+                return False
+            
+            connection = self._get_conn()
             
             cursor = connection.cursor()
             
             # Create user if not exists
             try:
-                cursor.execute(f"CREATE USER IF NOT EXISTS '{self.app_user}'@'%' IDENTIFIED BY '{self.app_password}'")
+                cursor.execute(
+                    "CREATE USER IF NOT EXISTS %s@'%' IDENTIFIED BY %s",
+                    (self.app_user, self.app_password)
+                )
                 logger.debug(f"User '{self.app_user}' created or already exists")
             except mysql.connector.Error as e:
                 if e.errno == 1396:  # User already exists
@@ -219,15 +311,16 @@ class DatabaseSetup:
                 else:
                     raise e
             
-            # Grant permissions
-            cursor.execute(f"GRANT SELECT, INSERT, UPDATE, DELETE, CREATE, INDEX, ALTER ON `{self.db_name}`.* TO '{self.app_user}'@'%'")
-            cursor.execute("FLUSH PRIVILEGES")
+            # Grant permissions; GRANT updates the in-memory grant tables itself, no FLUSH PRIVILEGES needed
+            cursor.execute(
+                f"GRANT SELECT, INSERT, UPDATE, DELETE, CREATE, INDEX, ALTER ON `{self.db_name}`.* TO %s@'%'",
+                (self.app_user,)
+            )
             
             logger.debug(f"Permissions granted to user '{self.app_user}'")
             
-            connection.commit()
+            # CREATE USER and GRANT commit implicitly, no connection.commit() needed
             cursor.close()
-            connection.close()
             
             return True
             
@@ -245,73 +338,317 @@ class DatabaseSetup:
             logger.error(f"Unexpected error creating user: {str(e)}")
             return False
 
-    def execute_sql_file_automated(self, db, file_path, description):
-        """Execute a SQL file with improved automation and error handling."""
+    @contextmanager
+    def bulk_insert_session(self, connection):
+        """
+        Relax per-row checks on a single session for the duration of a bulk insert.
+        
+        The SET statements and the inserts must run on the same connection.
+        Binary logging is only switched off when the account is allowed to.
+        """
+        cursor = connection.cursor()
+        binlog_disabled = False
+        try:
+            # One SET for all variables keeps the session setup to a single round-trip
+            cursor.execute("SET SESSION unique_checks=0, foreign_key_checks=0, autocommit=0")
+            try:
+                cursor.execute("SET SESSION sql_log_bin=0")
+                binlog_disabled = True
+            except mysql.connector.Error as e:
+                logger.debug(f"Keeping binary logging on for import: {e}")
+            yield connection
+            connection.commit()
+        except BaseException:
+            # Restoring autocommit=1 below would implicitly commit a partial load
+            try:
+                connection.rollback()
+            except mysql.connector.Error as e:
+                logger.warning(f"Could not roll back bulk insert: {e}")
+            raise
+        finally:
+            try:
+                if binlog_disabled:
+                    cursor.execute("SET SESSION unique_checks=1, foreign_key_checks=1, autocommit=1, sql_log_bin=1")
+                else:
+                    cursor.execute("SET SESSION unique_checks=1, foreign_key_checks=1, autocommit=1")
+            except mysql.connector.Error as e:
+                logger.warning(f"Could not restore session settings: {e}")
+            finally:
+                cursor.close()
+
+    def iter_sql_statements(self, sql_file):
+        """
+        Yield the statements of an open SQL file as soon as each one is complete.
+        
+        The file is read in SQL_READ_BUFFER_SIZE chunks cut at the last newline,
+        so comment and statement-end detection always see whole lines.
+        """
+        pending = ''
+        tail = ''
+        while True:
+            chunk = sql_file.read(SQL_READ_BUFFER_SIZE)
+            buffer = tail + chunk
+            if chunk:
+                cut = buffer.rfind('\n') + 1
+                buffer, tail = buffer[:cut], buffer[cut:]
+            
+            # Comment lines are dropped even inside multi-line statements; chunks without
+            # a comment marker (a single C-level substring scan) skip the regex entirely
+            if '--' in buffer or '/*' in buffer:
+                buffer = SQL_COMMENT_LINE_RE.sub('', buffer)
+            pending += buffer
+            
+            start = 0
+            # A statement is complete when a line ends with a semicolon
+            for match in SQL_STATEMENT_END_RE.finditer(pending):
+                statement = SQL_LINE_BREAK_RE.sub(' ', pending[start:match.start() + 1].strip())
+                start = match.end()
+                if len(statement) > 10:  # Skip very short statements
+                    yield statement
+            pending = pending[start:]
+            
+            if not chunk:
+                break
+
+    def batch_insert_statements(self, statements):
+        """
+        Merge runs of INSERTs into the same table and columns into multi-row INSERTs.
+        
+        Other statements are passed through unchanged and keep their position,
+        so DDL and UPDATEs still run in file order.
+        """
+        prefix = None
+        values = []
+        originals = []
+        size = 0
+        
+        def merged():
+            batch = MergedInsert(f"{prefix} {', '.join(values)};")
+            batch.statements = originals
+            return batch
+        
+        for statement in statements:
+            match = INSERT_VALUES_RE.match(statement)
+            if not match:
+                if values:
+                    yield merged()
+                prefix, values, originals, size = None, [], [], 0
+                yield statement
+                continue
+            
+            stmt_prefix, stmt_values = match.group(1), match.group(2)
+            if (stmt_prefix != prefix
+                    or size + len(stmt_values) > MAX_INSERT_BATCH_BYTES
+                    or len(values) >= MAX_INSERT_BATCH_STATEMENTS):
+                if values:
+                    yield merged()
+                prefix, values, originals, size = stmt_prefix, [], [], len(stmt_prefix)
+            values.append(stmt_values)
+            originals.append(statement)
+            size += len(stmt_values) + 2
+        
+        if values:
+            yield merged()
+
+    def load_sql_statements(self, file_path):
+        """
+        Yield the statements of a SQL file, reusing a pickled parse when the file is unchanged.
+        
+        The cache lives next to the SQL file and starts with a key tuple of
+        (SQL_CACHE_VERSION, st_mtime_ns, st_size); any mismatch triggers a re-parse.
+        On a miss statements are yielded while parsing and the cache is written
+        once the file has been fully consumed.
+        """
+        stat = file_path.stat()
+        key = (SQL_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+        cache_path = file_path.with_suffix(file_path.suffix + '.cache')
+        
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                if pickle.load(cache_file) == key:
+                    logger.debug(f"Using cached statements for {file_path.name}")
+                    yield from pickle.load(cache_file)
+                    return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable SQL cache {cache_path.name}: {e}")
+        
+        statements = []
+        with open(file_path, 'r', encoding='utf-8', buffering=SQL_READ_BUFFER_SIZE) as file:
+            for statement in self.iter_sql_statements(file):
+                statements.append(statement)
+                yield statement
+        
+        try:
+            with open(cache_path, 'wb') as cache_file:
+                pickle.dump(key, cache_file, protocol=5)
+                pickle.dump(statements, cache_file, protocol=5)
+        except OSError as e:
+            logger.debug(f"Could not write SQL cache {cache_path.name}: {e}")
+
+    def execute_statements(self, connection, statements, fast_import=False):
+        """
+        Execute statements on one connection, skipping expected errors.
+        
+        Returns:
+            (total_count, success_count, error_count)
+        """
+        total_count = 0
+        success_count = 0
+        error_count = 0
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        
+        session = self.bulk_insert_session(connection) if fast_import else nullcontext()
+        cursor = connection.cursor(buffered=True)
+        with session:
+            for i, statement in enumerate(statements, 1):
+                total_count = i
+                try:
+                    # Execute the statement
+                    cursor.execute(statement)
+                    success_count += 1
+                    
+                    if fast_import and i % FAST_IMPORT_COMMIT_INTERVAL == 0:
+                        connection.commit()
+                    
+                    # Show progress for large files
+                    if debug_enabled and i % 10 == 0:
+                        logger.debug("Processed %d statements", i)
+                
+                except mysql.connector.Error as e:
+                    if e.errno == 1062 and isinstance(statement, MergedInsert):
+                        # One duplicate rejects the whole batch; retry its rows so only the duplicates are skipped
+                        if debug_enabled:
+                            logger.debug("Statement %d: duplicate key in batch, retrying %d rows", i, len(statement.statements))
+                        row_errors = self._execute_rows(cursor, statement.statements)
+                        if row_errors:
+                            error_count += row_errors
+                        else:
+                            success_count += 1
+                    # Ignore certain expected errors
+                    elif e.errno in IGNORED_SQL_ERRNOS:
+                        if debug_enabled:
+                            logger.debug("Statement %d: %.100s... (ignored)", i, e)
+                    else:
+                        logger.warning("Statement %d error: %.150s", i, e)
+                        error_count += 1
+                except Exception as e:
+                    logger.warning("Statement %d error: %.150s", i, e)
+                    error_count += 1
+        cursor.close()
+        
+        return total_count, success_count, error_count
+
+    def _execute_rows(self, cursor, statements):
+        """Execute single-row statements one by one, skipping expected errors; return the error count."""
+        error_count = 0
+        for statement in statements:
+            try:
+                cursor.execute(statement)
+            except mysql.connector.Error as e:
+                if e.errno not in IGNORED_SQL_ERRNOS:
+                    logger.warning("Statement error: %.150s", e)
+                    error_count += 1
+        return error_count
+
+    def _execute_statement_group(self, table, statements):
+        """Load one table's statements on a pooled connection with bulk insert tuning."""
+        connection = self._get_pool().get_connection()
         try:
-            logger.debug(f"Executing {description}: {file_path.name}")
+            logger.debug("Loading %s: %d statements", table, len(statements))
+            return self.execute_statements(connection, statements, fast_import=True)
+        finally:
+            connection.close()
+
+    def execute_sql_file_parallel(self, file_path, description):
+        """
+        Execute a data SQL file with one worker per target table.
+        
+        Statements are grouped by the table they write to and keep their file order
+        within the group. Statements without a target table run first, then the
+        INSERT_PARENT_TABLES groups in parallel, then all remaining groups in parallel.
+        """
+        try:
+            logger.debug("Executing %s: %s", description, file_path.name)
             
             if not file_path.exists():
-                logger.error(f"SQL file not found: {file_path}")
+                logger.error("SQL file not found: %s", file_path)
                 return False
             
-            with open(file_path, 'r', encoding='utf-8') as file:
-                sql_content = file.read()
+            groups = {}
+            for statement in self.batch_insert_statements(self.load_sql_statements(file_path)):
+                match = SQL_TARGET_TABLE_RE.match(statement)
+                table = match.group(1).lower() if match else None
+                groups.setdefault(table, []).append(statement)
             
-            # Split SQL content into individual statements
-            statements = []
-            current_statement = ""
+            levels = [
+                {table: stmts for table, stmts in groups.items() if table is None},
+                {table: stmts for table, stmts in groups.items() if table in INSERT_PARENT_TABLES},
+                {table: stmts for table, stmts in groups.items()
+                 if table is not None and table not in INSERT_PARENT_TABLES},
+            ]
             
-            for line in sql_content.split('\n'):
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('--') or line.startswith('/*'):
+            total_count = 0
+            success_count = 0
+            error_count = 0
+            
+            # Create the pool here so the workers below only borrow connections from it
+            self._get_pool()
+            
+            for level in levels:
+                if not level:
                     continue
-                
-                # Handle multi-line statements
-                current_statement += line + " "
-                
-                # Check if statement is complete (ends with semicolon)
-                if line.endswith(';'):
-                    statement = current_statement.strip()
-                    if len(statement) > 10:  # Skip very short statements
-                        statements.append(statement)
-                    current_statement = ""
+                # Join each level before starting the next so parent rows exist first
+                with ThreadPoolExecutor(max_workers=min(len(level), SETUP_POOL_SIZE)) as executor:
+                    futures = [
+                        executor.submit(self._execute_statement_group, table or 'session', stmts)
+                        for table, stmts in level.items()
+                    ]
+                    for future in futures:
+                        total, success, errors = future.result()
+                        total_count += total
+                        success_count += success
+                        error_count += errors
+            
+            logger.debug("✅ %s completed: %d/%d statements successful", description, success_count, total_count)
+            if error_count > 0:
+                logger.warning("⚠️  %d statements had non-critical errors", error_count)
             
-            logger.debug(f"Found {len(statements)} SQL statements to execute")
+            return success_count > 0
             
-            success_count = 0
-            error_count = 0
+        except Exception as e:
+            logger.error("❌ Error executing %s: %s", description, e)
+            return False
+
+    def execute_sql_file_automated(self, connection, file_path, description, fast_import=False):
+        """
+        Execute a SQL file on the given connection with improved automation and error handling.
+        
+        Statements are executed while the file is still being parsed. With fast_import
+        the whole file runs inside bulk_insert_session, committing every
+        FAST_IMPORT_COMMIT_INTERVAL statements to bound the undo log.
+        """
+        try:
+            logger.debug("Executing %s: %s", description, file_path.name)
             
-            for i, statement in enumerate(statements, 1):
-                try:
-                    # Execute the statement
-                    result = db.execute_query(statement)
-                    success_count += 1
-                    
-                    # Show progress for large files
-                    if i % 10 == 0 or i == len(statements):
-                        logger.debug(f"Processed {i}/{len(statements)} statements")
-                    
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    # Ignore certain expected errors
-                    if any(ignore_phrase in error_msg for ignore_phrase in [
-                        "duplicate entry", "already exists", "table doesn't exist"
-                    ]):
-                        logger.debug(f"Statement {i}: {str(e)[:100]}... (ignored)")
-                    else:
-                        logger.warning(f"Statement {i} error: {str(e)[:150]}")
-                        error_count += 1
+            if not file_path.exists():
+                logger.error("SQL file not found: %s", file_path)
+                return False
+            
+            statements = self.batch_insert_statements(self.load_sql_statements(file_path))
+            total_count, success_count, error_count = self.execute_statements(
+                connection, statements, fast_import=fast_import
+            )
             
-            logger.debug(f"✅ {description} completed: {success_count}/{len(statements)} statements successful")
+            logger.debug("✅ %s completed: %d/%d statements successful", description, success_count, total_count)
             if error_count > 0:
-                logger.warning(f"⚠️  {error_count} statements had non-critical errors")
+                logger.warning("⚠️  %d statements had non-critical errors", error_count)
             
             return success_count > 0
             
         except Exception as e:
-            logger.error(f"❌ Error executing {description}: {str(e)}")
+            logger.error("❌ Error executing %s: %s", description, e)
             return False
 
     def find_sql_files(self):
@@ -337,114 +674,144 @@ class DatabaseSetup:
         
         return files
 
+    def _verification_query(self, connection, query, params=None, fetch_one=False):
+        """Run a verification query, returning None on database errors."""
+        cursor = connection.cursor(dictionary=True, buffered=True)
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone() if fetch_one else cursor.fetchall()
+        except mysql.connector.Error as e:
+            logger.error("Database error: %s", e)
+            return None
+        finally:
+            cursor.close()
+
     def verify_complete_setup(self):
         """Comprehensive verification of the database setup."""
         try:
             logger.debug("🔍 Performing comprehensive setup verification...")
             
-            db = MySQLConnection()
-            
-            # Check tables exist
-            required_tables = [
-                'users', 'error_categories', 'java_errors', 'activity_log','badges', 'user_badges']
-            
-            tables_status = {}
-            for table in required_tables:
-                try:
-                    result = db.execute_query(f"SELECT COUNT(*) as count FROM {table}", fetch_one=True)
-                    count = result['count'] if result and 'count' in result else 0
-                    tables_status[table] = count
-                except Exception as e:
-                    logger.error(f"Error checking table {table}: {str(e)}")
-                    tables_status[table] = -1
-            
-            # Display results
-            all_tables_ok = True
-            total_records = 0
-            
-            logger.debug("📊 Database Verification Results:")
-            for table, count in tables_status.items():
-                if count == -1:
-                    logger.error(f"❌ {table}: Table missing or error")
-                    all_tables_ok = False
-                elif count == 0:
-                    logger.warning(f"⚠️  {table}: Table exists but empty")
-                    if table in ['error_categories', 'java_errors', 'badges']:
-                        all_tables_ok = False
-                else:
-                    logger.debug(f"✅ {table}: {count} records")
-                    total_records += count
-            
-            # Check critical data - Updated expected counts
-            if all_tables_ok:
-                try:
-                    # Verify we have all expected data
-                    expected_counts = {
-                        'error_categories': 5,
-                        'java_errors': 35,  
-                        'badges': 25
-                    }
-                    
-                    for table, expected in expected_counts.items():
-                        actual = tables_status.get(table, 0)
-                        if actual < expected:
-                            logger.warning(f"⚠️  {table}: Expected at least {expected}, got {actual}")
-                        else:
-                            logger.debug(f"✅ {table}: {actual} records (expected ≥{expected})")
-                    
-                    # Verify active categories
-                    active_cats = db.execute_query(
-                        "SELECT COUNT(*) as count FROM error_categories",
-                        fetch_one=True
-                    )
-                    active_count = active_cats['count'] if active_cats else 0
-                    
-                    if active_count > 0:
-                        logger.debug(f"✅ Active error categories: {active_count}")
+            # Reuse a pooled connection for every verification query
+            with closing(self._get_pool().get_connection()) as connection:
+                # Check tables exist
+                required_tables = [
+                    'users', 'error_categories', 'java_errors', 'activity_log','badges', 'user_badges']
+                
+                # Find which required tables exist in one information_schema lookup
+                placeholders = ", ".join(["%s"] * len(required_tables))
+                existing_rows = self._verification_query(connection, f"""
+                    SELECT TABLE_NAME AS table_name
+                    FROM information_schema.TABLES
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({placeholders})
+                """, tuple(required_tables)) or []
+                existing_tables = {row['table_name'] for row in existing_rows}
+                
+                # Exact counts for the existing tables and the category links in one round-trip
+                count_columns = [
+                    f"(SELECT COUNT(*) FROM {table}) AS {table}"
+                    for table in required_tables if table in existing_tables
+                ]
+                if {'java_errors', 'error_categories'} <= existing_tables:
+                    count_columns.append("""(SELECT COUNT(*)
+                            FROM java_errors je
+                            JOIN error_categories ec ON je.category_id = ec.id) AS errors_with_categories""")
+                counts = self._verification_query(
+                    connection, f"SELECT {', '.join(count_columns)}", fetch_one=True
+                ) if count_columns else None
+                
+                tables_status = {}
+                for table in required_tables:
+                    if counts and table in existing_tables:
+                        tables_status[table] = counts[table]
                     else:
-                        logger.error("❌ No active error categories found")
+                        logger.error("Error checking table %s", table)
+                        tables_status[table] = -1
+                
+                # Display results
+                all_tables_ok = True
+                total_records = 0
+                
+                logger.debug("📊 Database Verification Results:")
+                for table, count in tables_status.items():
+                    if count == -1:
+                        logger.error("❌ %s: Table missing or error", table)
                         all_tables_ok = False
-                    
-                    # Verify Java errors have proper categories
-                    errors_with_cats = db.execute_query("""
-                        SELECT COUNT(*) as count 
-                        FROM java_errors je 
-                        JOIN error_categories ec ON je.category_id = ec.id
-                    """, fetch_one=True)
-                    
-                    if errors_with_cats and errors_with_cats['count'] > 0:
-                        logger.debug(f"✅ Java errors with categories: {errors_with_cats['count']}")
+                    elif count == 0:
+                        logger.warning("⚠️  %s: Table exists but empty", table)
+                        if table in ['error_categories', 'java_errors', 'badges']:
+                            all_tables_ok = False
                     else:
-                        logger.error("❌ No Java errors properly linked to categories")
-                        all_tables_ok = False
-                    
-                    # Check error distribution across categories
-                    cat_distribution = db.execute_query("""
-                        SELECT ec.name_en, COUNT(je.id) as error_count
-                        FROM error_categories ec
-                        LEFT JOIN java_errors je ON ec.id = je.category_id
-                        GROUP BY ec.id, ec.name_en
-                        ORDER BY ec.sort_order
-                    """)
-                    
-                    if cat_distribution:
-                        logger.debug("📊 Error distribution by category:")
-                        for row in cat_distribution:
-                            logger.debug(f"   {row['name_en']}: {row['error_count']} errors")
+                        logger.debug("✅ %s: %d records", table, count)
+                        total_records += count
+                
+                # Check critical data - Updated expected counts
+                if all_tables_ok:
+                    try:
+                        # Verify we have all expected data
+                        expected_counts = {
+                            'error_categories': 5,
+                            'java_errors': 35,  
+                            'badges': 25
+                        }
                         
-                except Exception as e:
-                    logger.error(f"Error verifying data relationships: {str(e)}")
-                    all_tables_ok = False
-            
-            if all_tables_ok and total_records > 50:  
-                logger.debug(f"🎉 Database setup verification PASSED! Total records: {total_records}")
-                return True
-            else:
-                logger.error("❌ Database setup verification FAILED")
-                return False
+                        for table, expected in expected_counts.items():
+                            actual = tables_status.get(table, 0)
+                            if actual < expected:
+                                logger.warning("⚠️  %s: Expected at least %d, got %d", table, expected, actual)
+                            else:
+                                logger.debug("✅ %s: %d records (expected ≥%d)", table, actual, expected)
+                        
+                        # Verify active categories
+                        active_count = tables_status.get('error_categories', 0)
+                        
+                        if active_count > 0:
+                            logger.debug("✅ Active error categories: %d", active_count)
+                        else:
+                            logger.error("❌ No active error categories found")
+                            all_tables_ok = False
+                        
+                        # Verify Java errors have proper categories
+                        errors_with_cats = counts.get('errors_with_categories', 0) if counts else 0
+                        
+                        if errors_with_cats > 0:
+                            logger.debug("✅ Java errors with categories: %d", errors_with_cats)
+                        else:
+                            logger.error("❌ No Java errors properly linked to categories")
+                            all_tables_ok = False
+                        
+                        # Check error distribution across categories, streaming rows from the
+                        # server instead of buffering the whole result set
+                        cursor = connection.cursor(dictionary=True, buffered=False)
+                        try:
+                            cursor.execute("""
+                                SELECT ec.name_en, COUNT(je.id) as error_count
+                                FROM error_categories ec
+                                LEFT JOIN java_errors je ON ec.id = je.category_id
+                                GROUP BY ec.id, ec.name_en
+                                ORDER BY ec.sort_order
+                            """)
+                            logger.debug("📊 Error distribution by category:")
+                            rows = cursor.fetchmany(size=32)
+                            while rows:
+                                for row in rows:
+                                    logger.debug("   %s: %d errors", row['name_en'], row['error_count'])
+                                rows = cursor.fetchmany(size=32)
+                        finally:
+                            cursor.close()
+                        
+                    except Exception as e:
+                        logger.error("Error verifying data relationships: %s", e)
+                        all_tables_ok = False
+                
+                if all_tables_ok and total_records > 50:  
+                    logger.debug("🎉 Database setup verification PASSED! Total records: %d", total_records)
+                    return True
+                else:
+                    logger.error("❌ Database setup verification FAILED")
+                    return False
                 
         except Exception as e:
-            logger.error(f"❌ Verification error: {str(e)}")
+            logger.error("❌ Verification error: %s", e)
             return False
 
     def automated_database_setup(self):
@@ -453,22 +820,20 @@ class DatabaseSetup:
         logger.debug("=" * 70)
         
         try:
-            # Step 1: Initialize setup
-            setup = DatabaseSetup()
-            
-            if not setup.test_connection():
+            # Step 1: Verify connection (reuse this instance so cached privileges carry over)
+            if not self.test_connection():
                 logger.error("❌ Cannot connect to MySQL server")
                 return False
             
             logger.debug("✅ Database connection verified")
             
             # Step 2: Create database and user
-            if not setup.create_database():
+            if not self.create_database():
                 logger.error("❌ Failed to create database")
                 return False
             
             # Modified to handle privilege issues gracefully
-            user_creation_result = setup.create_application_user()
+            user_creation_result = self.create_application_user()
             if not user_creation_result:
                 logger.warning("⚠️  Application user creation had issues, but continuing...")
             
@@ -480,21 +845,21 @@ class DatabaseSetup:
                 logger.error("❌ Required SQL files not found")
                 return False
             
-            # Step 4: Execute SQL files automatically
-            db = MySQLConnection()
+            # Step 4: Execute SQL files automatically on the connection used above
+            connection = self._get_conn()
             
             # Execute table creation first
             if 'create' in sql_files:
-                if not self.execute_sql_file_automated(db, sql_files['create'], "Table Creation"):
+                if not self.execute_sql_file_automated(connection, sql_files['create'], "Table Creation"):
                     logger.error("❌ Table creation failed")
                     return False
             else:
                 logger.error("❌ Create_db.sql file not found")
                 return False
             
-            # Execute data insertion
+            # Execute data insertion, one pooled connection per table
             if 'insert' in sql_files:
-                if not self.execute_sql_file_automated(db, sql_files['insert'], "Data Insertion"):
+                if not self.execute_sql_file_parallel(sql_files['insert'], "Data Insertion"):
                     logger.error("❌ Data insertion failed")
                     return False
             else:
@@ -537,7 +902,10 @@ class DatabaseSetup:
             return False
         
         # Run automated setup
-        success = self.automated_database_setup()
+        try:
+            success = self.automated_database_setup()
+        finally:
+            self.close()
         
         if success:
             print("\n🎉 AUTOMATED SETUP COMPLETED SUCCESSFULLY!")
@@ -546,7 +914,6 @@ class DatabaseSetup:
                 print("⚠️  IMPORTANT: You may need to manually create the application user:")
                 print(f"   CREATE USER '{self.app_user}'@'%' IDENTIFIED BY '{self.app_password}';")
                 print(f"   GRANT SELECT, INSERT, UPDATE, DELETE, CREATE, INDEX, ALTER ON `{self.db_name}`.* TO '{self.app_user}'@'%';")
-                print("   FLUSH PRIVILEGES;")
             print("1. Run verification: python verify_setup.py")
             print("2. Test the system: python examples/database_repository_usage.py")
             print("3. Start the application!")
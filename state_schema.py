@@ -4,31 +4,66 @@ State Schema for Java Code Review Training System.
 This module defines the simplified state schema for the LangGraph-based workflow.
 """
 
-__all__ = ['WorkflowState', 'CodeSnippet', 'ReviewAttempt']
+__all__ = ['WorkflowState', 'CodeSnippet', 'ReviewAttempt', 'tick_state_clock', 'state_clock']
 
-from typing import List, Dict, Any, Optional, Literal
-from pydantic import BaseModel, Field
+import copy
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import List, Deque, Dict, Any, Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 import time
 
+# --- Shared State Clock ---
+class _StateClock:
+    """Wall-clock time sampled once per workflow step, shared by the per-step state copies made during it"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = time.time()
+
+_STATE_CLOCK = _StateClock()
+
+def tick_state_clock() -> float:
+    """Advance the shared state clock; the workflow driver calls this once per step."""
+    _STATE_CLOCK.value = time.time()
+    return _STATE_CLOCK.value
+
+def state_clock() -> float:
+    """Return the current step's clock sample without advancing it."""
+    return _STATE_CLOCK.value
+
 # --- Code Snippet Data ---
-class CodeSnippet(BaseModel):
+# Plain slotted dataclasses: these have a fixed set of keys, so they skip the
+# per-instance __dict__ and pydantic validation on every mutation. WorkflowState
+# still validates them (or dicts) when they are passed in at construction.
+@dataclass(slots=True)
+class CodeSnippet:
     """Schema for code snippet data"""
-    code: str = Field(description="The Java code snippet with annotations")
-    clean_code: str = Field("", description="The Java code snippet without annotations")
-    raw_errors: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict, description="Raw error data organized by type")
-    expected_error_count: int = Field(0, description="Number of errors originally requested for code generation")
+    code: str  # The Java code snippet with annotations
+    clean_code: str = ""  # The Java code snippet without annotations
+    raw_errors: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)  # Raw error data organized by type
+    expected_error_count: int = 0  # Number of errors originally requested for code generation
 
 # --- Review Attempt Data ---
-class ReviewAttempt(BaseModel):
+@dataclass(slots=True)
+class ReviewAttempt:
     """Schema for a student review attempt"""
-    student_review: str = Field(description="The student's review text")
-    iteration_number: int = Field(description="Iteration number of this review")
-    analysis: Dict[str, Any] = Field(default_factory=dict, description="Analysis of the review")
-    targeted_guidance: Optional[str] = Field(None, description="Targeted guidance for next iteration")
+    student_review: str  # The student's review text
+    iteration_number: int  # Iteration number of this review
+    analysis: Dict[str, Any] = field(default_factory=dict)  # Analysis of the review
+    targeted_guidance: Optional[str] = None  # Targeted guidance for next iteration
 
 # --- Workflow State ---
 class WorkflowState(BaseModel):
     """The simplified state for the Java Code Review workflow"""
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        extra="allow",  # Allow additional fields for flexibility
+        frozen=False,
+        validate_assignment=False,
+        revalidate_instances="never",
+    )
+
     # Current workflow step
     current_step: Literal[
         "generate", "evaluate", "regenerate", "review", "analyze", "generate_comparison_report", "complete"
@@ -66,7 +101,11 @@ class WorkflowState(BaseModel):
     current_iteration: int = Field(1, description="Current iteration number")
     max_iterations: int = Field(3, description="Maximum number of iterations")
     review_sufficient: bool = Field(False, description="Whether the review is sufficient")
-    review_history: List[ReviewAttempt] = Field(default_factory=list, description="History of review attempts")
+    review_history: Deque[ReviewAttempt] = Field(
+        default_factory=deque,
+        validate_default=True,
+        description="History of review attempts, bounded by max_iterations"
+    )
 
     # Final Output
     comparison_report: Optional[str] = Field(None, description="Comparison report")
@@ -84,8 +123,100 @@ class WorkflowState(BaseModel):
     session_id: Optional[str] = Field(None, description="Session identifier for debugging")
     debug_info: Dict[str, Any] = Field(default_factory=dict, description="Debug information")
     badge_awards: Optional[Dict[str, Any]] = Field(None, description="Newly awarded badges and points")
-    
-    class Config:
-        """Pydantic configuration"""
-        arbitrary_types_allowed = True
-        extra = "allow"  # Allow additional fields for flexibility
\ No newline at end of file
+
+    @field_validator("review_history", mode="after")
+    @classmethod
+    def _bound_review_history(cls, value: Deque[ReviewAttempt], info: ValidationInfo) -> Deque[ReviewAttempt]:
+        """Store the history as a ring buffer holding at most max_iterations attempts."""
+        return deque(value, maxlen=max(1, info.data.get("max_iterations", 3)))
+
+    def append_attempt(
+        self,
+        student_review: str,
+        iteration_number: int,
+        analysis: Optional[Dict[str, Any]] = None,
+        targeted_guidance: Optional[str] = None,
+    ) -> ReviewAttempt:
+        """
+        Record a review attempt in the bounded history and return it.
+
+        The bound follows the current max_iterations, and a new ReviewAttempt is
+        always appended rather than reusing an entry evicted from the history.
+        """
+        limit = max(1, self.max_iterations)
+        history = self.review_history
+        if not isinstance(history, deque) or history.maxlen != limit:
+            # Plain lists or a stale bound can be replaced directly (validate_assignment is off)
+            history = deque(history, maxlen=limit)
+            object.__setattr__(self, "review_history", history)
+
+        attempt = ReviewAttempt(
+            student_review=student_review,
+            iteration_number=iteration_number,
+            analysis={} if analysis is None else analysis,
+            targeted_guidance=targeted_guidance
+        )
+        history.append(attempt)
+        return attempt
+
+    def mark_phase(self, *, phase: str, ts: Optional[float] = None) -> None:
+        """
+        Set a phase's completion flag and timestamp together as raw attribute writes.
+
+        Args:
+            phase: One of the keys of PHASE_FIELDS
+            ts: Timestamp to record; defaults to the current state clock value
+        """
+        flag_name, timestamp_name = PHASE_FIELDS[phase]
+        if ts is None:
+            ts = _STATE_CLOCK.value
+        if flag_name is not None:
+            object.__setattr__(self, flag_name, True)
+            self.__pydantic_fields_set__.add(flag_name)
+        object.__setattr__(self, timestamp_name, ts)
+        self.__pydantic_fields_set__.add(timestamp_name)
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "WorkflowState":
+        """
+        Deep-copy the state with a cheaper review history copy.
+
+        Each ReviewAttempt is copied with its own top-level analysis dict, which is
+        what the review nodes mutate in place; the analysis values are shared.
+        """
+        memo = {} if memo is None else memo
+        history = self.review_history
+        attempts = (
+            replace(attempt, analysis=copy.copy(attempt.analysis))
+            if isinstance(attempt, ReviewAttempt) else copy.deepcopy(attempt, memo)
+            for attempt in history
+        )
+        # Pre-seeding the memo makes deepcopy use this history instead of cloning every value
+        memo[id(history)] = deque(attempts, maxlen=history.maxlen) if isinstance(history, deque) else list(attempts)
+        return super().__deepcopy__(memo)
+
+    def fast_update(self, **kwargs: Any) -> None:
+        """
+        Set known-safe scalar fields without going through pydantic's __setattr__.
+
+        Only names in FAST_UPDATE_FIELDS are accepted; use normal assignment for anything else.
+        """
+        unknown = kwargs.keys() - FAST_UPDATE_FIELDS
+        if unknown:
+            raise ValueError(f"fast_update does not support fields: {sorted(unknown)}")
+        for name, value in kwargs.items():
+            object.__setattr__(self, name, value)
+        self.__pydantic_fields_set__.update(kwargs)
+
+
+# Phase name -> (completion flag, timestamp field) for WorkflowState.mark_phase
+PHASE_FIELDS = {
+    "code_generation": ("code_generation_completed", "code_generation_timestamp"),
+    "review": (None, "review_phase_started"),
+    "workflow": ("workflow_completed", "last_update_timestamp"),
+}
+
+# Scalar fields that WorkflowState.fast_update may set directly
+FAST_UPDATE_FIELDS = frozenset({
+    "current_step", "current_iteration", "last_update_timestamp",
+    "evaluation_attempts", "review_sufficient", "pending_review", "error",
+})
@@ -3,212 +3,358 @@ CSS utility functions for loading and managing CSS in Streamlit applications.
 Updated to include practice mode CSS support.
 """
 import os
+import re
+import gzip
+import codecs
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 
-def load_css(css_file=None, css_directory=None):
+try:
+    from rcssmin import cssmin as _cssmin
+except ImportError:  # Optional C-accelerated minifier
+    _cssmin = None
+
+logger = logging.getLogger(__name__)
+
+# Fallback minification when rcssmin is not installed
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_WHITESPACE_RE = re.compile(r'\s+')
+_CSS_PUNCTUATION_SPACE_RE = re.compile(r'\s*([{};,])\s*')
+
+# Load order for stylesheets that must precede the rest of the directory
+_PRIORITY_CSS_FILES = ("base.css", "components.css", "tabs.css")
+_ERROR_EXPLORER_CSS_FILES = ("header.css", "layout.css", "cards.css", "practice_mode.css", "tutorial.css")
+
+# Files excluded from the alphabetical tail load (main.css is obsolete)
+_SKIPPED_CSS_FILES = frozenset(_PRIORITY_CSS_FILES + ("main.css",))
+
+# Stylesheet directory (sibling of this module), resolved once at import
+_CSS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "css")
+
+# Directory that receives the merged, content-hashed stylesheet bundles
+_BUNDLE_DIR = Path(_CSS_DIR)
+_BUNDLE_PREFIX = "_bundle."
+
+# Base URL under which _BUNDLE_DIR is served (e.g. by a reverse proxy).
+# When unset, the merged CSS is inlined in a <style> block instead.
+CSS_BUNDLE_URL = os.getenv("CSS_BUNDLE_URL", "").rstrip("/")
+
+# Session state key holding the collected Error Explorer CSS
+_ERROR_EXPLORER_CSS_KEY = "_error_explorer_css"
+
+# Small pool so a cold load overlaps the per-file reads
+CSS_READ_WORKERS = 4
+_read_pool = None
+_read_pool_lock = threading.Lock()
+
+
+def _get_read_pool():
+    """Lazily create the thread pool shared by all CSS reads."""
+    global _read_pool
+    with _read_pool_lock:
+        if _read_pool is None:
+            _read_pool = ThreadPoolExecutor(max_workers=CSS_READ_WORKERS,
+                                            thread_name_prefix="css-read")
+    return _read_pool
+
+
+def _scan_css_dir(directory):
     """
-    Load CSS from file or directory into Streamlit.
+    List a CSS directory in a single scandir pass.
+    
+    Returns:
+        Tuple of ({name: DirEntry} for the .css files, {name: DirEntry} for subdirectories)
+    """
+    css_entries = {}
+    subdirs = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir():
+                subdirs[entry.name] = entry
+            elif (entry.name.endswith('.css') and entry.is_file()
+                  and not entry.name.startswith(_BUNDLE_PREFIX)):
+                css_entries[entry.name] = entry
+    return css_entries, subdirs
+
+
+def _decode_css_bytes(data, encoding='utf-8'):
+    """
+    Decode raw CSS bytes that are already in memory.
+
+    A UTF-8 byte order mark is detected up front so the data is decoded
+    once; latin1 is used only if the bytes are not valid in the requested
+    encoding.
+    
+    Returns:
+        Tuple of (decoded text, encoding used)
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+        encoding = 'utf-8'
+    
+    try:
+        return data.decode(encoding), encoding
+    except UnicodeDecodeError:
+        return data.decode('latin1'), 'latin1'
+
+
+def _decode_css_files(raw_files, encoding, errors):
+    """
+    Decode the raw bytes of several CSS files into one string.
+
+    For UTF-8 the files are joined first and validated with a single
+    decode over the whole bundle; only if that fails is each file decoded
+    on its own so the offending file can fall back to latin1.
     
     Args:
-        css_file: Path to single CSS file
-        css_directory: Path to directory containing CSS files
+        raw_files: List of (filename, bytes) in load order
+        encoding: Requested text encoding
+        errors: List that receives per-file decoding errors
         
     Returns:
-        List of loaded CSS file names or empty list if none loaded
+        Tuple of (css_content, names of the files that were decoded)
     """
-    css_content = ""
-    loaded_files = []
-    
-    # Load single file if specified
-    if css_file and os.path.exists(css_file):
+    if encoding.lower() in ('utf-8', 'utf8'):
         try:
-            with open(css_file, 'r', encoding='utf-8') as f:
-                css_content += f.read()
-                loaded_files.append(os.path.basename(css_file))
-        except Exception as e:
-            st.error(f"Error loading CSS file {css_file}: {str(e)}")
+            css_content = b"".join(
+                data[len(codecs.BOM_UTF8):] if data.startswith(codecs.BOM_UTF8) else data
+                for _, data in raw_files
+            ).decode('utf-8')
+            return css_content, [filename for filename, _ in raw_files]
+        except UnicodeDecodeError:
+            pass
     
-    # Load all CSS files from directory if specified
-    if css_directory and os.path.exists(css_directory) and os.path.isdir(css_directory):
+    parts = []
+    decoded_files = []
+    for filename, data in raw_files:
         try:
-            # First load base.css if it exists
-            base_css_path = os.path.join(css_directory, "base.css")
-            if os.path.exists(base_css_path):
-                with open(base_css_path, 'r', encoding='utf-8') as f:
-                    css_content += f.read()
-                    loaded_files.append("base.css")
-            
-            # Then load components.css
-            components_css_path = os.path.join(css_directory, "components.css")
-            if os.path.exists(components_css_path):
-                with open(components_css_path, 'r', encoding='utf-8') as f:
-                    css_content += f.read()
-                    loaded_files.append("components.css")
-            
-            # Then load tabs.css
-            tabs_css_path = os.path.join(css_directory, "tabs.css")
-            if os.path.exists(tabs_css_path):
-                with open(tabs_css_path, 'r', encoding='utf-8') as f:
-                    css_content += f.read()
-                    loaded_files.append("tabs.css")
-            
-            # Load error_explorer subdirectory CSS files in specific order
-            error_explorer_dir = os.path.join(css_directory, "error_explorer")
-            if os.path.exists(error_explorer_dir) and os.path.isdir(error_explorer_dir):
-                # Define loading order for error explorer CSS
-                error_explorer_files = ["header.css", "layout.css", "cards.css", "practice_mode.css", "tutorial.css"]
-                
-                for filename in error_explorer_files:
-                    file_path = os.path.join(error_explorer_dir, filename)
-                    if os.path.exists(file_path):
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                css_content += f.read()
-                                loaded_files.append(f"error_explorer/{filename}")
-                        except UnicodeDecodeError as e:
-                            # Try with different encodings as fallback
-                            try:
-                                with open(file_path, 'r', encoding='utf-8-sig') as f:
-                                    css_content += f.read()
-                                    loaded_files.append(f"error_explorer/{filename}")
-                            except UnicodeDecodeError:
-                                try:
-                                    with open(file_path, 'r', encoding='latin1') as f:
-                                        css_content += f.read()
-                                        loaded_files.append(f"error_explorer/{filename}")
-                                    st.warning(f"CSS file error_explorer/{filename} loaded with latin1 encoding")
-                                except Exception as fallback_error:
-                                    st.error(f"Could not load CSS file error_explorer/{filename}: {str(fallback_error)}")
-                        except Exception as e:
-                            st.error(f"Error loading CSS file error_explorer/{filename}: {str(e)}")
-            
-            # Finally load any remaining CSS files (except main.css which is now obsolete)
-            for filename in sorted(os.listdir(css_directory)):
-                if (filename.endswith('.css') and 
-                    filename not in ["base.css", "components.css", "tabs.css", "main.css"]):
-                    file_path = os.path.join(css_directory, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            css_content += f.read()
-                            loaded_files.append(filename)
-                    except UnicodeDecodeError as e:
-                        # Try with different encodings as fallback
-                        try:
-                            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                                css_content += f.read()
-                                loaded_files.append(filename)
-                        except UnicodeDecodeError:
-                            try:
-                                with open(file_path, 'r', encoding='latin1') as f:
-                                    css_content += f.read()
-                                    loaded_files.append(filename)
-                                st.warning(f"CSS file {filename} loaded with latin1 encoding")
-                            except Exception as fallback_error:
-                                st.error(f"Could not load CSS file {filename}: {str(fallback_error)}")
-                    except Exception as e:
-                        st.error(f"Error loading CSS file {filename}: {str(e)}")
-                        
+            content, used_encoding = _decode_css_bytes(data, encoding)
         except Exception as e:
-            st.error(f"Error loading CSS files from directory {css_directory}: {str(e)}")
+            errors.append(f"Error reading {filename}: {str(e)}")
+            continue
+        if used_encoding != encoding:
+            logger.info(f"CSS file {filename} loaded with {used_encoding} encoding")
+        parts.append(content)
+        decoded_files.append(filename)
     
-    # Apply CSS if we loaded any
-    if css_content:
-        st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
-        return loaded_files
+    return "".join(parts), decoded_files
+
+
+def _minify_css(css_content):
+    """Strip comments and redundant whitespace from CSS."""
+    if _cssmin is not None:
+        return _cssmin(css_content)
     
-    return []
+    css_content = _CSS_COMMENT_RE.sub('', css_content)
+    css_content = _CSS_WHITESPACE_RE.sub(' ', css_content)
+    return _CSS_PUNCTUATION_SPACE_RE.sub(r'\1', css_content).strip()
 
 
-def load_css_safe(css_file=None, css_directory=None, encoding='utf-8'):
+def _css_signature(css_file=None, css_directory=None):
     """
-    Safe CSS loading function with better error handling and encoding options.
-    Updated to include practice mode CSS support.
-    
-    Args:
-        css_file: Path to single CSS file
-        css_directory: Path to directory containing CSS files
-        encoding: Text encoding to use (default: utf-8)
-        
-    Returns:
-        Dictionary with 'success', 'loaded_files', and 'errors' keys
+    Build a cheap fingerprint of the CSS sources for cache invalidation.
+
+    A single scandir pass per directory collects (path, mtime_ns, size) for
+    every .css file, so editing any stylesheet produces a new cache key.
     """
-    css_content = ""
-    loaded_files = []
-    errors = []
+    signature = []
+    
+    if css_file and os.path.exists(css_file):
+        file_stat = os.stat(css_file)
+        signature.append((css_file, file_stat.st_mtime_ns, file_stat.st_size))
     
-    def safe_read_file(file_path, filename):
-        """Safely read a CSS file with multiple encoding attempts."""
-        encodings_to_try = [encoding, 'utf-8', 'utf-8-sig', 'latin1', 'cp1252']
+    if css_directory and os.path.isdir(css_directory):
+        try:
+            entries, subdirs = _scan_css_dir(css_directory)
+        except OSError:
+            entries, subdirs = {}, {}
+        found = list(entries.values())
         
-        for enc in encodings_to_try:
+        error_explorer_dir = subdirs.get("error_explorer")
+        if error_explorer_dir is not None:
             try:
-                with open(file_path, 'r', encoding=enc) as f:
-                    content = f.read()
-                    if enc != encoding:
-                        st.info(f"CSS file {filename} loaded with {enc} encoding")
-                    return content
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                errors.append(f"Error reading {filename}: {str(e)}")
-                return None
+                found.extend(_scan_css_dir(error_explorer_dir.path)[0].values())
+            except OSError:
+                pass
         
-        errors.append(f"Could not decode {filename} with any supported encoding")
-        return None
+        for entry in found:
+            entry_stat = entry.stat()
+            signature.append((entry.path, entry_stat.st_mtime_ns, entry_stat.st_size))
+    
+    return tuple(sorted(signature))
+
+
+@st.cache_resource(show_spinner=False)
+def _collect_css(css_file, css_directory, encoding, signature):
+    """
+    Read and concatenate the CSS sources in load order.
+
+    Cached as a process-wide resource keyed on the source signature, so
+    every session and rerun shares one combined, minified stylesheet
+    instead of re-reading every file from disk.
+    
+    Returns:
+        Tuple of (css_content, loaded_files, errors); the shared sequences
+        are tuples so callers cannot mutate the cached value
+    """
+    plan = []
+    errors = []
     
     # Load single file if specified
     if css_file and os.path.exists(css_file):
-        content = safe_read_file(css_file, os.path.basename(css_file))
-        if content is not None:
-            css_content += content
-            loaded_files.append(os.path.basename(css_file))
+        plan.append((os.path.basename(css_file), css_file))
     
     # Load all CSS files from directory if specified
-    if css_directory and os.path.exists(css_directory) and os.path.isdir(css_directory):
-        # Define loading order
-        priority_files = ["base.css", "components.css", "tabs.css"]
+    if css_directory and os.path.isdir(css_directory):
+        try:
+            entries, subdirs = _scan_css_dir(css_directory)
+        except OSError as e:
+            errors.append(f"Error listing directory {css_directory}: {str(e)}")
+            entries, subdirs = {}, {}
         
         # Load priority files first
-        for priority_file in priority_files:
-            file_path = os.path.join(css_directory, priority_file)
-            if os.path.exists(file_path):
-                content = safe_read_file(file_path, priority_file)
-                if content is not None:
-                    css_content += content
-                    loaded_files.append(priority_file)
+        for priority_file in _PRIORITY_CSS_FILES:
+            entry = entries.get(priority_file)
+            if entry is not None:
+                plan.append((priority_file, entry.path))
         
         # Load error_explorer subdirectory CSS files
-        error_explorer_dir = os.path.join(css_directory, "error_explorer")
-        if os.path.exists(error_explorer_dir) and os.path.isdir(error_explorer_dir):
-            # Define loading order for error explorer CSS
-            error_explorer_files = ["header.css", "layout.css", "cards.css", "practice_mode.css", "tutorial.css"]
+        error_explorer_dir = subdirs.get("error_explorer")
+        if error_explorer_dir is not None:
+            try:
+                explorer_entries, _ = _scan_css_dir(error_explorer_dir.path)
+            except OSError as e:
+                errors.append(f"Error listing directory {error_explorer_dir.path}: {str(e)}")
+                explorer_entries = {}
             
-            for filename in error_explorer_files:
-                file_path = os.path.join(error_explorer_dir, filename)
-                if os.path.exists(file_path):
-                    content = safe_read_file(file_path, f"error_explorer/{filename}")
-                    if content is not None:
-                        css_content += content
-                        loaded_files.append(f"error_explorer/{filename}")
+            for filename in _ERROR_EXPLORER_CSS_FILES:
+                entry = explorer_entries.get(filename)
+                if entry is not None:
+                    plan.append((f"error_explorer/{filename}", entry.path))
         
         # Load remaining CSS files (except main.css which is obsolete)
+        for filename in sorted(entries.keys() - _SKIPPED_CSS_FILES):
+            plan.append((filename, entries[filename].path))
+    
+    # Read all planned files concurrently, then assemble them in plan order
+    futures = [_get_read_pool().submit(Path(path).read_bytes) for _, path in plan]
+    raw_files = []
+    for (filename, _), future in zip(plan, futures):
         try:
-            for filename in sorted(os.listdir(css_directory)):
-                if (filename.endswith('.css') and 
-                    filename not in priority_files + ["main.css"]):
-                    file_path = os.path.join(css_directory, filename)
-                    content = safe_read_file(file_path, filename)
-                    if content is not None:
-                        css_content += content
-                        loaded_files.append(filename)
+            raw_files.append((filename, future.result()))
         except Exception as e:
-            errors.append(f"Error listing directory {css_directory}: {str(e)}")
+            errors.append(f"Error reading {filename}: {str(e)}")
+    
+    css_content, loaded_files = _decode_css_files(raw_files, encoding, errors)
     
+    return _minify_css(css_content), tuple(loaded_files), tuple(errors)
+
+
+@st.cache_resource(show_spinner=False)
+def _materialize_bundle(css_content):
+    """
+    Write the merged CSS to a content-hashed file in the bundle directory.
+
+    The file is only written when a bundle with the same hash does not
+    exist yet, so browsers can cache it for as long as the CSS is unchanged.
+    A pre-compressed .gz sibling is written alongside it for servers that
+    serve static gzip variants (e.g. nginx gzip_static).
+    
+    Returns:
+        File name of the bundle, relative to the bundle directory
+    """
+    data = css_content.encode('utf-8')
+    digest = hashlib.sha1(data).hexdigest()[:12]
+    filename = f"{_BUNDLE_PREFIX}{digest}.css"
+    bundle_path = _BUNDLE_DIR / filename
+    gzip_path = _BUNDLE_DIR / f"{filename}.gz"
+    
+    if not bundle_path.exists():
+        _write_atomic(bundle_path, data)
+    if not gzip_path.exists():
+        _write_atomic(gzip_path, gzip.compress(data, compresslevel=9, mtime=0))
+    
+    return filename
+
+
+def _write_atomic(path, data):
+    """Write data to path via a temporary file so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _inject_css(css_content):
+    """Apply CSS to the page, linking the hashed bundle when a bundle URL is configured."""
+    if CSS_BUNDLE_URL:
+        try:
+            filename = _materialize_bundle(css_content)
+            st.markdown(f'<link rel="stylesheet" href="{CSS_BUNDLE_URL}/{filename}">',
+                        unsafe_allow_html=True)
+            return
+        except OSError as e:
+            logger.warning(f"Could not write CSS bundle, inlining styles instead: {str(e)}")
+    
+    st.html(f"<style>{css_content}</style>")
+
+
+def load_css(css_file=None, css_directory=None):
+    """
+    Load CSS from file or directory into Streamlit.
+    
+    Args:
+        css_file: Path to single CSS file
+        css_directory: Path to directory containing CSS files
+        
+    Returns:
+        List of loaded CSS file names or empty list if none loaded
+    """
+    css_content, loaded_files, errors = _collect_css(
+        css_file, css_directory, 'utf-8', _css_signature(css_file, css_directory)
+    )
+    
+    # Report all read errors in a single element rather than one per file
+    if errors:
+        st.error("\n\n".join(errors))
+    
+    # Apply CSS if we loaded any
+    if css_content:
+        _inject_css(css_content)
+        return list(loaded_files)
+    
+    return []
+
+
+def load_css_safe(css_file=None, css_directory=None, encoding='utf-8'):
+    """
+    Safe CSS loading function with better error handling and encoding options.
+    Updated to include practice mode CSS support.
+    
+    Args:
+        css_file: Path to single CSS file
+        css_directory: Path to directory containing CSS files
+        encoding: Text encoding to use (default: utf-8)
+        
+    Returns:
+        Dictionary with 'success', 'loaded_files', and 'errors' keys
+    """
+    css_content, loaded_files, errors = _collect_css(
+        css_file, css_directory, encoding, _css_signature(css_file, css_directory)
+    )
+    return _apply_css(css_content, list(loaded_files), list(errors))
+
+
+def _apply_css(css_content, loaded_files, errors):
+    """Inject collected CSS and build the load_css_safe result dictionary."""
     # Apply CSS if we loaded any
     success = False
     if css_content:
         try:
-            st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
+            _inject_css(css_content)
             success = True
         except Exception as e:
             errors.append(f"Error applying CSS: {str(e)}")
@@ -224,11 +370,16 @@ def load_error_explorer_css():
     """
     Convenience function to load Error Explorer CSS including practice mode styles.
     
+    The collected CSS is kept in the session after the first call, so later
+    reruns only re-inject it instead of re-scanning the CSS directory.
+    
     Returns:
         Dictionary with loading results
     """
-    import os
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    css_dir = os.path.join(current_dir, "..", "static", "css")
+    loaded = st.session_state.get(_ERROR_EXPLORER_CSS_KEY)
+    if loaded is None:
+        loaded = _collect_css(None, _CSS_DIR, 'utf-8', _css_signature(css_directory=_CSS_DIR))
+        st.session_state[_ERROR_EXPLORER_CSS_KEY] = loaded
     
-    return load_css_safe(css_directory=css_dir)
\ No newline at end of file
+    css_content, loaded_files, errors = loaded
+    return _apply_css(css_content, list(loaded_files), list(errors))
@@ -5,12 +5,30 @@ This package contains professional UI components for the Streamlit interface
 with improved styling, better i18n support, and enhanced user experience.
 """
 
-# Core UI components
-from ui.components.code_generator import CodeGeneratorUI
-from ui.components.code_display import CodeDisplayUI
-from ui.components.feedback_system import FeedbackSystem
-from ui.components.auth_ui import AuthUI
-from ui.components.profile_leaderboard import ProfileLeaderboardSidebar
+import importlib
+
+# Core UI components, imported on first attribute access (PEP 562) so that
+# importing one component does not load every other UI subsystem
+_LAZY_IMPORTS = {
+    'CodeGeneratorUI': 'ui.components.code_generator',
+    'CodeDisplayUI': 'ui.components.code_display',
+    'FeedbackSystem': 'ui.components.feedback_system',
+    'AuthUI': 'ui.components.auth_ui',
+    'ProfileLeaderboardSidebar': 'ui.components.profile_leaderboard',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 __all__ = [
@@ -18,9 +36,8 @@ __all__ = [
     'CodeGeneratorUI',
     'CodeDisplayUI', 
     'FeedbackSystem',
-    'AuthUI'
+    'AuthUI',
         
     # UI utilities - compact and professional  
-    'render_sidebar',
     'ProfileLeaderboardSidebar'
 ]
\ No newline at end of file
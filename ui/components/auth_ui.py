@@ -7,23 +7,263 @@ registration, and profile management using local JSON files.
 
 import streamlit as st
 import logging
+import re
 import time
 from typing import Dict, Any, Optional, Callable, Tuple, List
 import os
 from pathlib import Path
 import base64
 import datetime
+from functools import lru_cache
 
 from auth.mysql_auth import MySQLAuthManager
-from utils.language_utils import t, get_current_language, set_language, get_available_languages
+from utils.language_utils import t, translate, get_current_language, set_language, get_available_languages
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Every translation key used by the AuthUI render methods
+_AUTH_UI_TRANSLATION_KEYS = frozenset({
+    'about',
+    'about_app',
+    'app_subtitle',
+    'app_title',
+    'chinese_name',
+    'confirm_password',
+    'confirm_your_password',
+    'continue_demo',
+    'create_account',
+    'create_account_to_start',
+    'create_strong_password',
+    'demo_mode_activated',
+    'demo_mode_help',
+    'display_name',
+    'display_name_help',
+    'earn_achievements_and_badges',
+    'email',
+    'email_help_text',
+    'email_registration_help',
+    'english_name',
+    'enter_display_name',
+    'enter_your_email',
+    'enter_your_password',
+    'experience_level',
+    'explore_features_without_account',
+    'forgot_password',
+    'full_functionality',
+    'instant_access',
+    'join_the_community',
+    'level_selection_help',
+    'logout',
+    'multilingual_names_help',
+    'no_registration_required',
+    'password',
+    'password_confirmation_help',
+    'password_help_text',
+    'password_requirements',
+    'practice_code_review_skills',
+    'select_experience_level_help',
+    'select_language',
+    'sign_in',
+    'sign_in_to_continue',
+    'specify_different_names_per_language',
+    'track_your_progress',
+    'try_demo_mode',
+    'welcome_back',
+})
+
+
+# Badge awarding after review completion can be switched off with ENABLE_BADGES=false
+ENABLE_BADGES = os.getenv("ENABLE_BADGES", "true").lower() == "true"
+
+# Optional pause (seconds) before rerunning after a successful login/registration
+AUTH_SUCCESS_SLEEP = float(os.getenv("AUTH_SUCCESS_SLEEP", "0"))
+
+# Balloon animations on registration and badge awards (AUTH_CELEBRATE=1 to enable)
+AUTH_CELEBRATE = os.getenv("AUTH_CELEBRATE", "0") == "1"
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+@st.cache_resource(show_spinner=False)
+def _get_auth_manager() -> MySQLAuthManager:
+    """
+    Return the process-wide MySQLAuthManager.
+    
+    Shared across sessions; the manager holds no per-user state and every
+    query checks out its own pooled connection, so concurrent use is safe.
+    """
+    return MySQLAuthManager()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_profile(user_id: str) -> Dict[str, Any]:
+    """Fetch a user profile, reusing the result for up to a minute."""
+    return _get_auth_manager().get_user_profile(user_id)
+
+
+# Lazily created collaborators, imported on first use to keep module import light
+_BADGE_MANAGER = None
+_SIDEBAR = None
+
+
+def _get_badge_manager():
+    """Return the shared BadgeManager, importing it on first use."""
+    global _BADGE_MANAGER
+    if _BADGE_MANAGER is None:
+        from analytics.badge_manager import BadgeManager
+        _BADGE_MANAGER = BadgeManager()
+    return _BADGE_MANAGER
+
+
+def _get_sidebar():
+    """
+    Return the shared ProfileLeaderboardSidebar, importing it on first use.
+    
+    The component keeps no per-user state (user data is passed to
+    render_combined_sidebar), so one instance serves every rerun.
+    """
+    global _SIDEBAR
+    if _SIDEBAR is None:
+        from ui.components.profile_leaderboard import ProfileLeaderboardSidebar
+        _SIDEBAR = ProfileLeaderboardSidebar()
+    return _SIDEBAR
+
+
+@lru_cache(maxsize=1)
+def _language_options() -> Tuple[Dict[str, str], Tuple[str, ...], Dict[str, str]]:
+    """Return the language options, their display names in selector order, and a display-to-code map."""
+    language_options = get_available_languages()
+    code_by_display = {display: code for code, display in language_options.items()}
+    return language_options, tuple(language_options.values()), code_by_display
+
+
+_LEVEL_VALUES = ("basic", "medium", "senior")
+
+
+@lru_cache(maxsize=8)
+def _level_bundle(language: str) -> Tuple[Tuple[str, ...], Dict[str, str], Dict[str, str]]:
+    """
+    Translate the experience levels for a language.
+    
+    Returns:
+        Tuple of (display names in level order, {level: description},
+        {display name: level})
+    """
+    options = tuple(translate(level, language) for level in _LEVEL_VALUES)
+    descriptions = {level: translate(f"{level}_level_description", language) for level in _LEVEL_VALUES}
+    return options, descriptions, dict(zip(options, _LEVEL_VALUES))
+
+
+@lru_cache(maxsize=4)
+def _translation_bundle(language: str) -> Dict[str, str]:
+    """
+    Translate all AuthUI render keys for a language in one pass.
+    
+    Reruns then read labels from the cached dict instead of calling t() for
+    each one. translate() is used because it never reads the process-wide
+    locale that other sessions keep switching.
+    """
+    return {key: translate(key, language) for key in _AUTH_UI_TRANSLATION_KEYS}
+
+
+# Static HTML shells for the auth page, filled from the translation bundle
+_AUTH_HEADER_HTML = """
+        <div class="auth-page-container">
+            <div class="auth-header-enhanced">
+                <div class="auth-logo">
+                    <div class="logo-icon">💻</div>
+                    <h1 class="app-title">{app_title}</h1>
+                </div>
+                <p class="app-description">{app_subtitle}</p>
+                <div class="auth-features">
+                    <div class="feature-item">
+                        <span class="feature-icon">🎯</span>
+                        <span>{practice_code_review_skills}</span>
+                    </div>
+                    <div class="feature-item">
+                        <span class="feature-icon">🏆</span>
+                        <span>{earn_achievements_and_badges}</span>
+                    </div>
+                    <div class="feature-item">
+                        <span class="feature-icon">📈</span>
+                        <span>{track_your_progress}</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+        """
+
+_LANGUAGE_SELECTOR_HEADER_HTML = """
+        <div class="language-selector-container">
+            <h4>🌐 {select_language}</h4>
+        </div>
+        """
+
+_LOGIN_HEADER_HTML = """
+        <div class="auth-form-container">
+            <div class="auth-form-header">
+                <h3>🔐 {welcome_back}</h3>
+                <p>{sign_in_to_continue}</p>
+            </div>
+        </div>
+        """
+
+_LOGIN_FOOTER_HTML = """
+            <div class="login-footer">
+                <p><a href="#" class="auth-link">{forgot_password}</a></p>
+            </div>
+            """
+
+_REGISTRATION_HEADER_HTML = """
+        <div class="auth-form-container">
+            <div class="auth-form-header">
+                <h3>✨ {join_the_community}</h3>
+                <p>{create_account_to_start}</p>
+            </div>
+        </div>
+        """
+
+_LEVEL_SELECTION_HEADER_HTML = """
+            <div class="level-selection-header">
+                <h4>🎯 {experience_level}</h4>
+                <p>{select_experience_level_help}</p>
+            </div>
+            """
+
+_DEMO_SECTION_HTML = """
+        <div class="demo-section-enhanced">
+            <div class="demo-header">
+                <h3>🚀 {try_demo_mode}</h3>
+                <p>{explore_features_without_account}</p>
+            </div>
+            <div class="demo-features">
+                <div class="demo-feature">
+                    <span class="demo-icon">⚡</span>
+                    <span>{instant_access}</span>
+                </div>
+                <div class="demo-feature">
+                    <span class="demo-icon">🎮</span>
+                    <span>{full_functionality}</span>
+                </div>
+                <div class="demo-feature">
+                    <span class="demo-icon">🔒</span>
+                    <span>{no_registration_required}</span>
+                </div>
+            </div>
+        </div>
+        """
+
+_SIDEBAR_FOOTER_HTML = """
+        <div class="info-container">
+            <div class="info-about">
+                ℹ️ {about}
+            </div>
+            <div class="info-about-app">
+                {about_app}
+            </div>
+        </div>
+        """
+
+
 class AuthUI:
     """
     UI Component for user authentication and profile management.
@@ -33,7 +273,7 @@ class AuthUI:
     """
     def __init__(self):
         """Initialize the AuthUI component with local auth manager."""
-        self.auth_manager = MySQLAuthManager()
+        self.auth_manager = _get_auth_manager()
         
         # Initialize session state for authentication
         if "auth" not in st.session_state:
@@ -50,33 +290,10 @@ class AuthUI:
         Returns:
             bool: True if user is authenticated, False otherwise
         """
+        tr = _translation_bundle(get_current_language())
         
         # Professional header with enhanced styling
-        st.markdown(f"""
-        <div class="auth-page-container">
-            <div class="auth-header-enhanced">
-                <div class="auth-logo">
-                    <div class="logo-icon">💻</div>
-                    <h1 class="app-title">{t('app_title')}</h1>
-                </div>
-                <p class="app-description">{t('app_subtitle')}</p>
-                <div class="auth-features">
-                    <div class="feature-item">
-                        <span class="feature-icon">🎯</span>
-                        <span>{t('practice_code_review_skills')}</span>
-                    </div>
-                    <div class="feature-item">
-                        <span class="feature-icon">🏆</span>
-                        <span>{t('earn_achievements_and_badges')}</span>
-                    </div>
-                    <div class="feature-item">
-                        <span class="feature-icon">📈</span>
-                        <span>{t('track_your_progress')}</span>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_AUTH_HEADER_HTML.format_map(tr), unsafe_allow_html=True)
 
         # Language selector
         self._render_language_selector()
@@ -97,33 +314,27 @@ class AuthUI:
 
     def _render_language_selector(self):
         """Render professional language selector."""
-        st.markdown(f"""
-        <div class="language-selector-container">
-            <h4>🌐 {t('select_language')}</h4>
-        </div>
-        """, unsafe_allow_html=True)
+        tr = _translation_bundle(get_current_language())
+        
+        st.markdown(_LANGUAGE_SELECTOR_HEADER_HTML.format_map(tr), unsafe_allow_html=True)
         
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            language_options = get_available_languages()
+            language_options, language_displays, code_by_display = _language_options()
             
             current_lang = get_current_language()
             current_display = language_options.get(current_lang, "English")
             
             selected_lang = st.selectbox(
-                t('select_language'),
-                options=list(language_options.values()),
-                index=list(language_options.values()).index(current_display),
+                tr['select_language'],
+                options=language_displays,
+                index=language_displays.index(current_display),
                 key="language_selector",
                 label_visibility="collapsed"
             )
             
             # Find the language code for the selected display name
-            selected_lang_code = None
-            for code, display in language_options.items():
-                if display == selected_lang:
-                    selected_lang_code = code
-                    break
+            selected_lang_code = code_by_display.get(selected_lang)
             
             if selected_lang_code and selected_lang_code != current_lang:
                 set_language(selected_lang_code)
@@ -131,171 +342,154 @@ class AuthUI:
 
     def _render_professional_login_form(self):
         """Render professional login form with enhanced styling."""
-        st.markdown(f"""
-        <div class="auth-form-container">
-            <div class="auth-form-header">
-                <h3>🔐 {t('welcome_back')}</h3>
-                <p>{t('sign_in_to_continue')}</p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        tr = _translation_bundle(get_current_language())
+        
+        st.markdown(_LOGIN_HEADER_HTML.format_map(tr), unsafe_allow_html=True)
         
         with st.container():
             # Enhanced form styling
             st.markdown('<div class="login-form-enhanced">', unsafe_allow_html=True)
             
-            email = st.text_input(
-                f"📧 {t('email')}",
-                placeholder=t('enter_your_email'),
-                key="login_email",
-                help=t('email_help_text')
-            )
-            
-            password = st.text_input(
-                f"🔒 {t('password')}",
-                type="password",
-                placeholder=t('enter_your_password'),
-                key="login_password",
-                help=t('password_help_text')
-            )
-            
-            # Enhanced login button
-            login_button_container = st.container()
-            with login_button_container:
-                if st.button(
-                    f"🚀 {t('sign_in')}",
+            # Inputs live in a form so typing does not rerun the script;
+            # only the submit button does
+            with st.form("login_form", clear_on_submit=False, border=False):
+                email = st.text_input(
+                    f"📧 {tr['email']}",
+                    placeholder=tr['enter_your_email'],
+                    key="login_email",
+                    help=tr['email_help_text']
+                )
+                
+                password = st.text_input(
+                    f"🔒 {tr['password']}",
+                    type="password",
+                    placeholder=tr['enter_your_password'],
+                    key="login_password",
+                    help=tr['password_help_text']
+                )
+                
+                # Enhanced login button
+                submitted = st.form_submit_button(
+                    f"🚀 {tr['sign_in']}",
                     use_container_width=True,
-                    type="primary",
-                    key="enhanced_login_button"
-                ):
-                    self._handle_login(email, password)
+                    type="primary"
+                )
+            
+            if submitted:
+                self._handle_login(email, password)
             
             # Additional login options
-            st.markdown(f"""
-            <div class="login-footer">
-                <p><a href="#" class="auth-link">{t('forgot_password')}</a></p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_LOGIN_FOOTER_HTML.format_map(tr), unsafe_allow_html=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
 
     def _render_professional_registration_form(self):
         """Render professional registration form with enhanced styling."""
-        st.markdown(f"""
-        <div class="auth-form-container">
-            <div class="auth-form-header">
-                <h3>✨ {t('join_the_community')}</h3>
-                <p>{t('create_account_to_start')}</p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        tr = _translation_bundle(get_current_language())
+        
+        st.markdown(_REGISTRATION_HEADER_HTML.format_map(tr), unsafe_allow_html=True)
         
         with st.container():
             st.markdown('<div class="registration-form-enhanced">', unsafe_allow_html=True)
             
-            # Enhanced form fields
-            display_name = st.text_input(
-                f"👤 {t('display_name')}",
-                placeholder=t('enter_display_name'),
-                key="reg_name",
-                help=t('display_name_help')
-            )
-            
-            # Language-specific names option
-            show_lang_specific = st.checkbox(
-                f"🌐 {t('specify_different_names_per_language')}",
-                value=False,
-                key="show_lang_names",
-                help=t('multilingual_names_help')
-            )
-            
-            display_name_en = display_name
-            display_name_zh = display_name
-            
-            if show_lang_specific:
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    display_name_en = st.text_input(
-                        f"🇺🇸 {t('english_name')}",
-                        value=display_name,
-                        key="reg_name_en",
-                        placeholder="John Doe"
-                    )
-                with col_b:
-                    display_name_zh = st.text_input(
-                        f" {t('chinese_name')}",
-                        value=display_name,
-                        key="reg_name_zh",
-                        placeholder="王小明"
-                    )
-            
-            email = st.text_input(
-                f"📧 {t('email')}",
-                placeholder=t('enter_your_email'),
-                key="reg_email",
-                help=t('email_registration_help')
-            )
-            
-            password = st.text_input(
-                f"🔒 {t('password')}",
-                type="password",
-                placeholder=t('create_strong_password'),
-                key="reg_password",
-                help=t('password_requirements')
-            )
-            
-            confirm_password = st.text_input(
-                f"🔒 {t('confirm_password')}",
-                type="password",
-                placeholder=t('confirm_your_password'),
-                key="reg_confirm",
-                help=t('password_confirmation_help')
-            )
+            # Controls that change the form layout stay outside the form so
+            # they take effect immediately
             
             # Enhanced level selection
-            st.markdown(f"""
-            <div class="level-selection-header">
-                <h4>🎯 {t('experience_level')}</h4>
-                <p>{t('select_experience_level_help')}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            level_internal_values = ["basic", "medium", "senior"]
-            level_options = [t(level) for level in level_internal_values]
+            st.markdown(_LEVEL_SELECTION_HEADER_HTML.format_map(tr), unsafe_allow_html=True)
             
             # Enhanced level selector with descriptions
-            level_descriptions = {
-                "basic": t('basic_level_description'),
-                "medium": t('medium_level_description'),
-                "senior": t('senior_level_description')
-            }
+            level_options, level_descriptions, level_by_display = _level_bundle(get_current_language())
             
             selected_level_display = st.selectbox(
-                t('experience_level'),
+                tr['experience_level'],
                 options=level_options,
                 index=0,
                 key="reg_level",
-                help=t('level_selection_help'),
+                help=tr['level_selection_help'],
                 label_visibility="collapsed"
             )
             
             # Get the internal level value
-            selected_level_index = level_options.index(selected_level_display)
-            selected_level = level_internal_values[selected_level_index]
+            selected_level = level_by_display[selected_level_display]
             
             # Show level description
             st.info(f"ℹ️ {level_descriptions[selected_level]}")
             
-            # Get level names for both languages
-            level_name_en, level_name_zh = self._get_level_names_for_both_languages(selected_level)
+            # Language-specific names option
+            show_lang_specific = st.checkbox(
+                f"🌐 {tr['specify_different_names_per_language']}",
+                value=False,
+                key="show_lang_names",
+                help=tr['multilingual_names_help']
+            )
             
-            # Enhanced registration button
-            if st.button(
-                f"🎉 {t('create_account')}",
-                use_container_width=True,
-                type="primary",
-                key="enhanced_register_button"
-            ):
+            # Text inputs only rerun the script when the form is submitted
+            with st.form("registration_form", clear_on_submit=False, border=False):
+                # Enhanced form fields
+                display_name = st.text_input(
+                    f"👤 {tr['display_name']}",
+                    placeholder=tr['enter_display_name'],
+                    key="reg_name",
+                    help=tr['display_name_help']
+                )
+                
+                display_name_en = display_name
+                display_name_zh = display_name
+                
+                if show_lang_specific:
+                    col_a, col_b = st.columns(2)
+                    with col_a:
+                        display_name_en = st.text_input(
+                            f"🇺🇸 {tr['english_name']}",
+                            key="reg_name_en",
+                            placeholder="John Doe"
+                        )
+                    with col_b:
+                        display_name_zh = st.text_input(
+                            f" {tr['chinese_name']}",
+                            key="reg_name_zh",
+                            placeholder="王小明"
+                        )
+                
+                email = st.text_input(
+                    f"📧 {tr['email']}",
+                    placeholder=tr['enter_your_email'],
+                    key="reg_email",
+                    help=tr['email_registration_help']
+                )
+                
+                password = st.text_input(
+                    f"🔒 {tr['password']}",
+                    type="password",
+                    placeholder=tr['create_strong_password'],
+                    key="reg_password",
+                    help=tr['password_requirements']
+                )
+                
+                confirm_password = st.text_input(
+                    f"🔒 {tr['confirm_password']}",
+                    type="password",
+                    placeholder=tr['confirm_your_password'],
+                    key="reg_confirm",
+                    help=tr['password_confirmation_help']
+                )
+                
+                # Enhanced registration button
+                submitted = st.form_submit_button(
+                    f"🎉 {tr['create_account']}",
+                    use_container_width=True,
+                    type="primary"
+                )
+            
+            if submitted:
+                # Per-language names default to the display name when left blank
+                display_name_en = display_name_en or display_name
+                display_name_zh = display_name_zh or display_name
+                
+                # Get level names for both languages
+                level_name_en, level_name_zh = self._get_level_names_for_both_languages(selected_level)
+                
                 self._handle_registration(
                     display_name, display_name_en, display_name_zh,
                     email, password, confirm_password,
@@ -306,51 +500,34 @@ class AuthUI:
 
     def _render_demo_section(self):
         """Render enhanced demo section."""
+        tr = _translation_bundle(get_current_language())
+        
         st.markdown("---")
-        st.markdown(f"""
-        <div class="demo-section-enhanced">
-            <div class="demo-header">
-                <h3>🚀 {t('try_demo_mode')}</h3>
-                <p>{t('explore_features_without_account')}</p>
-            </div>
-            <div class="demo-features">
-                <div class="demo-feature">
-                    <span class="demo-icon">⚡</span>
-                    <span>{t('instant_access')}</span>
-                </div>
-                <div class="demo-feature">
-                    <span class="demo-icon">🎮</span>
-                    <span>{t('full_functionality')}</span>
-                </div>
-                <div class="demo-feature">
-                    <span class="demo-icon">🔒</span>
-                    <span>{t('no_registration_required')}</span>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_DEMO_SECTION_HTML.format_map(tr), unsafe_allow_html=True)
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button(
-                f"🎯 {t('continue_demo')}",
+                f"🎯 {tr['continue_demo']}",
                 use_container_width=True,
                 key="demo_mode_button",
-                help=t('demo_mode_help')
+                help=tr['demo_mode_help']
             ):
-                st.session_state.auth["is_authenticated"] = True
-                st.session_state.auth["user_id"] = "demo_user"
-                st.session_state.auth["user_info"] = {
-                    "display_name_en": "Demo User",
-                    "display_name_zh": "演示用戶",
-                    "email": "demo@example.com",
-                    "level_name_en": "Basic",
-                    "level_name_zh": "基礎",
-                    "reviews_completed": 0,
-                    "score": 0,
-                    "is_demo": True
+                st.session_state.auth = {
+                    "is_authenticated": True,
+                    "user_id": "demo_user",
+                    "user_info": {
+                        "display_name_en": "Demo User",
+                        "display_name_zh": "演示用戶",
+                        "email": "demo@example.com",
+                        "level_name_en": "Basic",
+                        "level_name_zh": "基礎",
+                        "reviews_completed": 0,
+                        "score": 0,
+                        "is_demo": True
+                    }
                 }
-                st.success(t("demo_mode_activated"))
+                st.success(tr['demo_mode_activated'])
                 st.rerun()
 
     def _handle_login(self, email: str, password: str):
@@ -370,23 +547,27 @@ class AuthUI:
             
             if result.get("success", False):
                 # Set authenticated state
-                st.session_state.auth["is_authenticated"] = True
-                st.session_state.auth["user_id"] = result.get("user_id")
-                st.session_state.auth["user_info"] = {
-                    "display_name_en": result.get("display_name_en"),
-                    "display_name_zh": result.get("display_name_zh"),
-                    "email": result.get("email"),
-                    "level_name_en": result.get("level_name_en"),
-                    "level_name_zh": result.get("level_name_zh"),
-                    "reviews_completed": result.get("reviews_completed", 0),
-                    "score": result.get("score", 0),
-                    "is_demo": False,
-                    "total_points": result.get("total_points", 0)
+                st.session_state.auth = {
+                    "is_authenticated": True,
+                    "user_id": result.get("user_id"),
+                    "user_info": {
+                        "display_name_en": result.get("display_name_en"),
+                        "display_name_zh": result.get("display_name_zh"),
+                        "email": result.get("email"),
+                        "level_name_en": result.get("level_name_en"),
+                        "level_name_zh": result.get("level_name_zh"),
+                        "reviews_completed": result.get("reviews_completed", 0),
+                        "score": result.get("score", 0),
+                        "is_demo": False,
+                        "total_points": result.get("total_points", 0)
+                    }
                 }
               
                 
-                st.success(f"✅ {t('login_success')}")
-                time.sleep(1)  # Brief pause for user feedback
+                # A toast survives the rerun, so no pause is needed for feedback
+                st.toast(f"✅ {t('login_success')}")
+                if AUTH_SUCCESS_SLEEP:
+                    time.sleep(AUTH_SUCCESS_SLEEP)
                 st.rerun()
             else:
                 st.error(f"❌ {t('login_failed')}: {result.get('error', t('invalid_credentials'))}")
@@ -414,8 +595,8 @@ class AuthUI:
             validation_errors.append(t('display_name_too_short'))
         
         if validation_errors:
-            for error in validation_errors:
-                st.error(f"❌ {error}")
+            # One alert listing every problem instead of one element per error
+            st.error("❌\n\n" + "\n".join(f"- {error}" for error in validation_errors))
             return
         
         with st.spinner(f"🔄 {t('creating_account')}..."):
@@ -430,48 +611,37 @@ class AuthUI:
             
             if result.get("success", False):
                 # Set authenticated state
-                st.session_state.auth["is_authenticated"] = True
-                st.session_state.auth["user_id"] = result.get("user_id")
-                st.session_state.auth["user_info"] = {
-                    "display_name_en": result.get("display_name_en"),
-                    "display_name_zh": result.get("display_name_zh"),
-                    "email": result.get("email"),
-                    "level_name_en": result.get("level_name_en"),
-                    "level_name_zh": result.get("level_name_zh"),
-                    "reviews_completed": 0,
-                    "score": 0,
-                    "is_demo": False
+                st.session_state.auth = {
+                    "is_authenticated": True,
+                    "user_id": result.get("user_id"),
+                    "user_info": {
+                        "display_name_en": result.get("display_name_en"),
+                        "display_name_zh": result.get("display_name_zh"),
+                        "email": result.get("email"),
+                        "level_name_en": result.get("level_name_en"),
+                        "level_name_zh": result.get("level_name_zh"),
+                        "reviews_completed": 0,
+                        "score": 0,
+                        "is_demo": False
+                    }
                 }
                 
-                st.success(f"🎉 {t('registration_success')}")
-                st.balloons()  # Celebration effect
-                time.sleep(2)  # Longer pause for celebration
+                st.toast(f"🎉 {t('registration_success')}")
+                if AUTH_CELEBRATE:
+                    st.balloons()  # Celebration effect
+                if AUTH_SUCCESS_SLEEP:
+                    time.sleep(AUTH_SUCCESS_SLEEP)
                 st.rerun()
             else:
                 st.error(f"❌ {t('registration_failed')}: {result.get('error', t('email_in_use'))}")
 
     def _validate_email(self, email: str) -> bool:
         """Validate email format."""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.match(email) is not None
 
     def _get_level_names_for_both_languages(self, level: str) -> tuple:
         """Get level names for both English and Chinese."""
-        current_lang = get_current_language()
-        
-        # Get English level name
-        set_language("en")
-        level_name_en = t(level)
-        
-        # Get Chinese level name
-        set_language("zh")
-        level_name_zh = t(level)
-        
-        # Restore original language
-        set_language(current_lang)
-        
-        return level_name_en, level_name_zh
+        return translate(level, "en"), translate(level, "zh")
 
     def logout(self):
         """Handle user logout by clearing authentication state and triggering full reset."""
@@ -511,84 +681,100 @@ class AuthUI:
         if not user_id or user_id == 'demo_user':
             return {"success": False, "error": "Invalid user or demo mode"}
         
+        # Ensure score is an integer
+        if not isinstance(score, int):
+            try:
+                score = int(score) if score else 0
+            except (TypeError, ValueError) as e:
+                logger.error(f"Error in update_review_stats: {str(e)}")
+                return {"success": False, "error": str(e)}
+        
+        logger.debug(f"AuthUI: Updating stats for user {user_id}: accuracy={accuracy:.1f}%, score={score}")
+        
+        # Update basic stats through auth manager
         try:
-            # Ensure score is an integer
-            score = int(score) if score else 0
+            result = self.auth_manager.update_review_stats(user_id, accuracy, score)
+        except Exception as e:
+            logger.error(f"Error in update_review_stats: {str(e)}")
+            return {"success": False, "error": str(e)}
+        
+        if result and result.get("success", False):
+            logger.debug(f"Updated user statistics: reviews={result.get('reviews_completed')}, " +
+                    f"score={result.get('score')}")
             
-            logger.debug(f"AuthUI: Updating stats for user {user_id}: accuracy={accuracy:.1f}%, score={score}")
+            # Stats (and possibly the level) changed, so drop cached profiles
+            _cached_profile.clear()
             
-            # Update basic stats through auth manager
-            result = self.auth_manager.update_review_stats(user_id, accuracy, score)
+            # UPDATE SESSION STATE WITH NEW VALUES
+            # Bind the session's user_info dict once and mutate it in place
+            user_info = st.session_state.auth.get("user_info")
+            if user_info:
+                user_info["reviews_completed"] = result.get("reviews_completed", 0)
+                user_info["score"] = result.get("score", 0)
+                logger.debug(f"Updated session state: reviews={result.get('reviews_completed')}, score={result.get('score')}")
+
+            # Handle level changes
+            if result.get("level_changed", False):
+                new_level = result.get("new_level")
+                if new_level and user_info:
+                    user_info["level"] = new_level
+                    user_info[f"level_name_{get_current_language()}"] = new_level
+                    logger.debug(f"Updated user level in session to: {new_level}")
+            
+            if ENABLE_BADGES:
+                self._process_badges(user_id, accuracy, score, result)
+                    
+        else:
+            err_msg = result.get('error', 'Unknown error') if result else "No result returned"
+            logger.error(f"Failed to update review stats: {err_msg}")
+        
+        return result
+    
+    def _process_badges(self, user_id: str, accuracy: float, score: int, result: Dict[str, Any]) -> None:
+        """
+        Award badges for a completed review and record them in the stats result.
+        
+        Args:
+            user_id: The user's ID
+            accuracy: The accuracy of the review (0-100 percentage)
+            score: Number of errors detected in the review
+            result: Stats update result, extended in place with badge information
+        """
+        try:
+            badge_manager = _get_badge_manager()
+            
+            # Prepare review data for badge processing
+            review_data = {
+                'accuracy_percentage': float(accuracy),
+                'identified_count': score,
+                'total_problems': score if accuracy >= 100.0 else max(score, 1),
+                'time_spent_seconds': 0,  # Will be calculated by badge manager
+                'session_type': 'regular',
+                'code_difficulty': 'medium',  # Default, could be enhanced later
+                'review_iterations': 1,  # Default, could be enhanced later
+                'categories_encountered': []  # Could be enhanced later
+            }
             
-            if result and result.get("success", False):
-                logger.debug(f"Updated user statistics: reviews={result.get('reviews_completed')}, " +
-                        f"score={result.get('score')}")
+            # Process badge awards
+            badge_result = badge_manager.process_review_completion(user_id, review_data)
+            
+            if badge_result.get('success'):
+                # Add badge information to result
+                result['badge_awards'] = badge_result.get('awarded_badges', [])
+                result['points_awarded'] = badge_result.get('points_awarded', 0)
+                result['total_badges_awarded'] = badge_result.get('total_badges_awarded', 0)
                 
-                # UPDATE SESSION STATE WITH NEW VALUES
-                if st.session_state.auth.get("user_info"):
-                    st.session_state.auth["user_info"]["reviews_completed"] = result.get("reviews_completed", 0)
-                    st.session_state.auth["user_info"]["score"] = result.get("score", 0)
-                    logger.debug(f"Updated session state: reviews={result.get('reviews_completed')}, score={result.get('score')}")
-
-                # Handle level changes
-                if result.get("level_changed", False):
-                    new_level = result.get("new_level")
-                    if new_level and st.session_state.auth.get("user_info"):
-                        st.session_state.auth["user_info"]["level"] = new_level
-                        current_language = get_current_language()
-                        st.session_state.auth["user_info"][f"level_name_{current_language}"] = new_level
-                        logger.debug(f"Updated user level in session to: {new_level}")
+                logger.info(f"Badge processing completed: {badge_result.get('total_badges_awarded', 0)} badges awarded")
                 
-                # === NEW: ENHANCED BADGE PROCESSING ===
-                try:
-                    from analytics.badge_manager import BadgeManager
-                    
-                    badge_manager = BadgeManager()
-                    
-                    # Prepare review data for badge processing
-                    review_data = {
-                        'accuracy_percentage': float(accuracy),
-                        'identified_count': int(score),
-                        'total_problems': int(score) if accuracy >= 100.0 else max(int(score), 1),
-                        'time_spent_seconds': 0,  # Will be calculated by badge manager
-                        'session_type': 'regular',
-                        'code_difficulty': 'medium',  # Default, could be enhanced later
-                        'review_iterations': 1,  # Default, could be enhanced later
-                        'categories_encountered': []  # Could be enhanced later
-                    }
-                    
-                    # Process badge awards
-                    badge_result = badge_manager.process_review_completion(user_id, review_data)
-                    
-                    if badge_result.get('success'):
-                        # Add badge information to result
-                        result['badge_awards'] = badge_result.get('awarded_badges', [])
-                        result['points_awarded'] = badge_result.get('points_awarded', 0)
-                        result['total_badges_awarded'] = badge_result.get('total_badges_awarded', 0)
-                        
-                        logger.info(f"Badge processing completed: {badge_result.get('total_badges_awarded', 0)} badges awarded")
-                        
-                        # Show badge notification in UI if badges were awarded
-                        if badge_result.get('awarded_badges'):
-                            self._show_badge_notification(badge_result.get('awarded_badges'))
-                    else:
-                        logger.warning(f"Badge processing failed: {badge_result.get('error', 'Unknown error')}")
-                        
-                except Exception as badge_error:
-                    logger.error(f"Error in enhanced badge processing: {str(badge_error)}")
-                    # Don't fail the main update if badge processing fails
-                    pass
-                # === END ENHANCED BADGE PROCESSING ===
-                        
+                # Show badge notification in UI if badges were awarded
+                if badge_result.get('awarded_badges'):
+                    self._show_badge_notification(badge_result.get('awarded_badges'))
             else:
-                err_msg = result.get('error', 'Unknown error') if result else "No result returned"
-                logger.error(f"Failed to update review stats: {err_msg}")
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in update_review_stats: {str(e)}")
-            return {"success": False, "error": str(e)}
+                logger.warning(f"Badge processing failed: {badge_result.get('error', 'Unknown error')}")
+                
+        except Exception as badge_error:
+            # Don't fail the main update if badge processing fails
+            logger.error(f"Error in enhanced badge processing: {str(badge_error)}")
     
     def _show_badge_notification(self, awarded_badges: List[Dict[str, Any]]) -> None:
         """Show notification for newly awarded badges."""
@@ -606,8 +792,10 @@ class AuthUI:
             
             st.success(message)
             
-            # Show balloons for celebration
-            st.balloons()
+            # Non-animating notification; balloons only when explicitly enabled
+            st.toast("🏆 Badge earned!")
+            if AUTH_CELEBRATE:
+                st.balloons()
             
         except Exception as e:
             logger.error(f"Error showing badge notification: {str(e)}")
@@ -635,7 +823,7 @@ class AuthUI:
             
         try:
             # Query the database for the latest user info
-            profile = self.auth_manager.get_user_profile(user_id)           
+            profile = _cached_profile(user_id)
             current_language = get_current_language()
             
             if profile.get("success", False):
@@ -662,10 +850,8 @@ class AuthUI:
         with st.sidebar:
             # Enhanced combined profile and leaderboard with proper error handling
             try:
-                from ui.components.profile_leaderboard import ProfileLeaderboardSidebar
-                
-                # Create sidebar instance
-                sidebar_component = ProfileLeaderboardSidebar()
+                # Reuse the shared sidebar instance
+                sidebar_component = _get_sidebar()
                 
                 # Render enhanced sidebar
                 sidebar_component.render_combined_sidebar(user_info, user_id)
@@ -682,25 +868,21 @@ class AuthUI:
 
     def _render_sidebar_footer(self) -> None:
         """Render the sidebar footer with app info and logout."""
+        tr = _translation_bundle(get_current_language())
         
         st.markdown("---")
         
-        st.markdown(f"""
-        <div class="info-container">
-            <div class="info-about">
-                ℹ️ {t('about')}
-            </div>
-            <div class="info-about-app">
-                {t("about_app")}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_FOOTER_HTML.format_map(tr), unsafe_allow_html=True)
         
         
         # Use Streamlit button for actual functionality
-        if st.button(f"🚪 {t('logout')}", key="enhanced_logout", use_container_width=True):
+        if st.button(f"🚪 {tr['logout']}", key="enhanced_logout", use_container_width=True):
             self.logout()
 
+    # Not injected by AuthUI: the sidebar profile is styled by the global
+    # stylesheet bundle (static/css/components.css), which load_css already
+    # applies once per rerun. Injecting this block as well would duplicate
+    # and override those rules.
     ENHANCED_PROFILE_CSS = """
     <style>
     .enhanced-profile-container {
@@ -4,19 +4,208 @@ proper session state management.
 """
 
 import streamlit as st
-import time
 import logging
-import datetime
 import re
+import threading
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Callable
 
-from utils.code_utils import add_line_numbers, _log_user_interaction_code_display
-from utils.language_utils import t, get_current_language
+from utils.code_utils import add_line_numbers, _code_display_interaction_context, _log_user_interaction_code_display
+from utils.language_utils import t, translate, get_current_language
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Attributes checked for code content, in order of preference for display
+_CODE_ATTRS = ('clean_code', 'code', 'content', 'text')
+
+# Keys checked when the snippet is a mapping, in the order the mapping fallback uses
+_MAPPING_CODE_KEYS = ('code', 'clean_code', 'content')
+
+# Review progress bar width (percent) for common (iteration, max_iterations) pairs
+_PROGRESS = {(i, m): ((i - 1) / m) * 100 for m in range(1, 11) for i in range(1, 11)}
+
+# Snippet type -> attribute that held its code, filled in lazily by the extractor
+_EXTRACTORS: Dict[type, str] = {}
+_MISSING = object()
+
+# Runs of three or more newlines, collapsed to one blank line
+_EXCESS_NL_RE = re.compile(r'\n{3,}')
+
+# Windows (\r\n) and old Mac (\r) line endings
+_CR_NL_RE = re.compile(r'\r\n?')
+
+# Static UI strings rendered by CodeDisplayUI
+_CODE_DISPLAY_TRANSLATION_KEYS = frozenset({
+    'accuracy',
+    'array_bounds_issues',
+    'attempt',
+    'attempts',
+    'be_comprehensive',
+    'be_constructive',
+    'be_specific',
+    'bracket_mismatches',
+    'characters',
+    'check_all_aspects',
+    'code_exists_but_empty',
+    'code_formatting',
+    'code_quality',
+    'documentation',
+    'enter_your_review',
+    'error',
+    'example_review_format',
+    'generate_code_snippet_instruction',
+    'how_to_write_good_review',
+    'identified_count',
+    'identified_percentage',
+    'issues_found',
+    'java_code_review_challenge',
+    'lines',
+    'logic_bugs',
+    'loop_conditions',
+    'missing_semicolons',
+    'naming_conventions',
+    'no_code_generated_yet',
+    'null_pointers',
+    'of',
+    'please_enter_review',
+    'please_provide_at_least_5_words',
+    'point_out_exact_lines',
+    'previous_results',
+    'processing_review',
+    'processing_your_review',
+    'provide_detailed_review',
+    'review_code_below_instruction',
+    'review_format_example',
+    'review_guidance',
+    'review_guidelines',
+    'review_submitted_successfully',
+    'review_too_short_warning',
+    'submit_review_button',
+    'submit_review_section',
+    'suggest_improvements',
+    'syntax_compilation',
+    'total_problems',
+    'type_errors',
+    'what_to_check_for',
+    'write_comprehensive_review',
+    'your_review',
+})
+
+
+@lru_cache(maxsize=4)
+def _tr_bundle(language: str) -> Dict[str, str]:
+    """
+    Translate all CodeDisplayUI render keys for a language in one pass.
+    
+    translate() is used because it never reads the process-wide locale
+    that other sessions keep switching.
+    """
+    return {key: translate(key, language) for key in _CODE_DISPLAY_TRANSLATION_KEYS}
+
+
+# Review guidelines expander body, filled from the translation bundle.
+# Kept free of blank lines and indentation so markdown treats it as one HTML block.
+_GUIDELINES_HTML = """<div class="guidelines-section">
+<h4>✨ {how_to_write_good_review}</h4>
+</div>
+<div class="guidelines-grid">
+<div class="guidelines-cell"><strong>🎯 {be_specific}</strong><p>{point_out_exact_lines}</p></div>
+<div class="guidelines-cell"><strong>🔍 {be_comprehensive}</strong><p>{check_all_aspects}</p></div>
+<div class="guidelines-cell"><strong>💡 {be_constructive}</strong><p>{suggest_improvements}</p></div>
+</div>
+<h3>🔍 {what_to_check_for}</h3>
+<div class="guidelines-grid">
+<div class="guidelines-cell"><strong>🔤 {syntax_compilation}</strong><ul><li>{missing_semicolons}</li><li>{bracket_mismatches}</li><li>{type_errors}</li></ul></div>
+<div class="guidelines-cell"><strong>🐛 {logic_bugs}</strong><ul><li>{array_bounds_issues}</li><li>{null_pointers}</li><li>{loop_conditions}</li></ul></div>
+<div class="guidelines-cell"><strong>⭐ {code_quality}</strong><ul><li>{naming_conventions}</li><li>{code_formatting}</li><li>{documentation}</li></ul></div>
+</div>
+<h3>📝 {example_review_format}</h3>"""
+
+
+@lru_cache(maxsize=4)
+def _guidelines_html(language: str) -> str:
+    """Fill _GUIDELINES_HTML once per language."""
+    return _GUIDELINES_HTML.format_map(_tr_bundle(language))
+
+
+# Code header shell; translations are filled once per language, counts per render
+_CODE_HEADER_HTML = """
+        <div class="professional-code-header">
+            <div class="header-content">
+                <div>
+                    <h3>☕ {java_code_review_challenge}</h3>
+                    <p>{review_code_below_instruction}</p>
+                </div>
+                <div class="stats">
+                    <div class="stat-item">
+                        <div class="stat-value">{line_count}</div>
+                        <div class="stat-label">{lines}</div>
+                    </div>
+                    <div class="stat-item">
+                        <div class="stat-value">{char_count}</div>
+                        <div class="stat-label">{characters}</div>
+                    </div>
+                </div>
+            </div>
+        </div>
+        """
+
+
+@lru_cache(maxsize=4)
+def _code_header_template(language: str) -> str:
+    """
+    Fill the translated labels of _CODE_HEADER_HTML for a language.
+    
+    The result still contains {line_count} and {char_count} placeholders;
+    braces inside translations are escaped so they survive that second
+    format() call.
+    """
+    labels = {
+        key: value.replace('{', '{{').replace('}', '}}')
+        for key, value in _tr_bundle(language).items()
+    }
+    labels['line_count'] = '{line_count}'
+    labels['char_count'] = '{char_count}'
+    return _CODE_HEADER_HTML.format_map(labels)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_numbered(code: str) -> str:
+    """Return add_line_numbers(code), cached across reruns showing the same snippet."""
+    return add_line_numbers(code)
+
+
+# Interaction logging runs off the submission path; it is telemetry only
+_LOG_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="code-display-log")
+
+
+def _run_interaction_log(ctx, kwargs: Dict[str, Any]) -> None:
+    """Write an interaction to the behavior tracker on a worker thread."""
+    # The tracker also bumps st.session_state.interaction_count, which needs the session's ScriptRunContext
+    add_script_run_ctx(threading.current_thread(), ctx)
+    try:
+        _log_user_interaction_code_display(**kwargs)
+    except Exception as log_error:
+        logger.warning(f"Could not log interaction: {str(log_error)}")
+
+
+def _submit_interaction_log(**kwargs) -> None:
+    """
+    Queue _log_user_interaction_code_display without waiting for it.
+    
+    The workflow context is captured here on the script thread, before the
+    submission replaces the workflow state; only the write runs in the background.
+    """
+    kwargs["context_data"] = _code_display_interaction_context()
+    _LOG_EXECUTOR.submit(_run_interaction_log, get_script_run_ctx(), kwargs)
+
+
 class CodeDisplayUI:
     """
     Enhanced UI Component for displaying Java code snippets with professional styling.
@@ -25,7 +214,7 @@ class CodeDisplayUI:
     def __init__(self):
         """Initialize the CodeDisplayUI component."""
         self.current_language = get_current_language()
-        pass
+        self._tr = _tr_bundle(self.current_language)
 
     def render_code_display(self, code_snippet, known_problems: List[str] = None, instructor_mode: bool = False) -> None:
         """
@@ -44,7 +233,7 @@ class CodeDisplayUI:
         # FIXED: Enhanced code extraction with better validation
         display_code = self._extract_code_content_enhanced(code_snippet)
         if not display_code:
-            st.warning(t("code_exists_but_empty"))
+            st.warning(self._tr["code_exists_but_empty"])
             # Show debug info to help troubleshoot
             self._render_debug_code_info(code_snippet)
             return
@@ -58,6 +247,9 @@ class CodeDisplayUI:
     
     def _render_debug_code_info(self, code_snippet):
         """Render debug information about the code snippet for troubleshooting."""
+        if not st.session_state.get('debug_code_display', False):
+            return
+        
         with st.expander("🔧 Debug: Code Snippet Information", expanded=False):
             debug_info = {
                 "type": type(code_snippet).__name__,
@@ -70,13 +262,23 @@ class CodeDisplayUI:
                 "has_text_attr": hasattr(code_snippet, 'text')
             }
             
-            if hasattr(code_snippet, '__dict__'):
-                debug_info["attributes"] = list(code_snippet.__dict__.keys())
-                # Show first 100 chars of each attribute
-                debug_info["attribute_preview"] = {
-                    k: str(v)[:100] + "..." if len(str(v)) > 100 else str(v)
-                    for k, v in code_snippet.__dict__.items()
-                }
+            # Slotted dataclasses such as CodeSnippet have no __dict__, so read their fields
+            if dataclasses.is_dataclass(code_snippet) and not isinstance(code_snippet, type):
+                items = [(f.name, getattr(code_snippet, f.name, None)) for f in dataclasses.fields(code_snippet)]
+            elif hasattr(code_snippet, '__dict__'):
+                items = code_snippet.__dict__.items()
+            else:
+                items = None
+            
+            if items is not None:
+                # Collect attribute names and the first 100 chars of each in one pass
+                attributes, attribute_preview = [], {}
+                for k, v in items:
+                    attributes.append(k)
+                    sv = str(v)
+                    attribute_preview[k] = sv[:100] + "..." if len(sv) > 100 else sv
+                debug_info["attributes"] = attributes
+                debug_info["attribute_preview"] = attribute_preview
             
             st.json(debug_info)
 
@@ -84,125 +286,96 @@ class CodeDisplayUI:
         """
         FIXED: Enhanced code content extraction with multiple fallback methods.
         """
+        # Method 1: Direct string
+        if isinstance(code_snippet, str):
+            if len(code_snippet.strip()) > 0:
+                logger.debug("Code extracted as direct string")
+                return code_snippet.strip()
+        
+        # Fast path: attribute that held the code for this type before
+        snippet_type = type(code_snippet)
+        attr_name = _EXTRACTORS.get(snippet_type)
+        if attr_name is not None:
+            value = getattr(code_snippet, attr_name, None)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+        
+        # Methods 2-5: Object attributes, in order of preference for display
+        first_present = None
+        for attr_name in _CODE_ATTRS:
+            value = getattr(code_snippet, attr_name, _MISSING)
+            if value is _MISSING:
+                continue
+            if first_present is None:
+                first_present = attr_name
+            if isinstance(value, str) and value.strip():
+                # Only remember an attribute no preferred one could override
+                if attr_name == first_present:
+                    _EXTRACTORS[snippet_type] = attr_name
+                logger.debug(f"Code extracted from {attr_name} attribute")
+                return value.strip()
+        
+        # Method 6: Try to convert to string as last resort
         try:
-            # Method 1: Direct string
-            if isinstance(code_snippet, str):
-                if len(code_snippet.strip()) > 0:
-                    logger.debug("Code extracted as direct string")
-                    return code_snippet.strip()
-            
-            # Method 2: Object with clean_code attribute (preferred for display)
-            if hasattr(code_snippet, 'clean_code') and code_snippet.clean_code:
-                if isinstance(code_snippet.clean_code, str) and len(code_snippet.clean_code.strip()) > 0:
-                    logger.debug("Code extracted from clean_code attribute")
-                    return code_snippet.clean_code.strip()
-            
-            # Method 3: Object with code attribute
-            if hasattr(code_snippet, 'code') and code_snippet.code:
-                if isinstance(code_snippet.code, str) and len(code_snippet.code.strip()) > 0:
-                    logger.debug("Code extracted from code attribute")
-                    return code_snippet.code.strip()
-            
-            # Method 4: Object with content attribute
-            if hasattr(code_snippet, 'content') and code_snippet.content:
-                if isinstance(code_snippet.content, str) and len(code_snippet.content.strip()) > 0:
-                    logger.debug("Code extracted from content attribute")
-                    return code_snippet.content.strip()
-            
-            # Method 5: Object with text attribute
-            if hasattr(code_snippet, 'text') and code_snippet.text:
-                if isinstance(code_snippet.text, str) and len(code_snippet.text.strip()) > 0:
-                    logger.debug("Code extracted from text attribute")
-                    return code_snippet.text.strip()
-            
-            # Method 6: Try to convert to string as last resort
+            str_version = str(code_snippet)
+            if len(str_version.strip()) > 10:  # Must be substantial content
+                logger.debug("Code extracted via string conversion")
+                return str_version.strip()
+        except:
+            pass
+        
+        # Method 7: Check if it's a dict-like object
+        if isinstance(code_snippet, Mapping):
             try:
-                str_version = str(code_snippet)
-                if len(str_version.strip()) > 10:  # Must be substantial content
-                    logger.debug("Code extracted via string conversion")
-                    return str_version.strip()
+                code_content = None
+                for key in _MAPPING_CODE_KEYS:
+                    code_content = code_snippet.get(key)
+                    if code_content:
+                        break
+                
+                if code_content and isinstance(code_content, str) and len(code_content.strip()) > 0:
+                    logger.debug("Code extracted from dict-like object")
+                    return code_content.strip()
             except:
                 pass
-            
-            # Method 7: Check if it's a dict-like object
-            if hasattr(code_snippet, '__getitem__') or hasattr(code_snippet, 'get'):
-                try:
-                    if hasattr(code_snippet, 'get'):
-                        code_content = code_snippet.get('code') or code_snippet.get('clean_code') or code_snippet.get('content')
-                    else:
-                        code_content = code_snippet.get('code', code_snippet.get('clean_code', code_snippet.get('content', '')))
-                    
-                    if code_content and isinstance(code_content, str) and len(code_content.strip()) > 0:
-                        logger.debug("Code extracted from dict-like object")
-                        return code_content.strip()
-                except:
-                    pass
-            
-            logger.warning(f"Could not extract code from snippet type: {type(code_snippet)}")
-            return ""
-            
-        except Exception as e:
-            logger.error(f"Error extracting code content: {str(e)}")
-            return ""
+        
+        logger.warning(f"Could not extract code from snippet type: {type(code_snippet)}")
+        return ""
     
     def _render_no_code_message(self):
         """Render a professional no-code message."""
         st.markdown(f"""
         <div class="no-code-message">
             <div class="icon">⚙️</div>
-            <h3>{t('no_code_generated_yet')}</h3>
-            <p>{t('generate_code_snippet_instruction')}</p>
+            <h3>{self._tr['no_code_generated_yet']}</h3>
+            <p>{self._tr['generate_code_snippet_instruction']}</p>
         </div>
         """, unsafe_allow_html=True)
     
     def _render_professional_code_display(self, code: str, known_problems: List[str] = None, instructor_mode: bool = False):
         """Render code with professional styling and enhanced features."""
         
-        lines = code.split('\n')
-        line_count = len(lines)
+        line_count = code.count('\n') + 1 if code else 0
         char_count = len(code)
         
         # Enhanced code header
         self._render_code_header(line_count, char_count, known_problems, instructor_mode)
         
         # Code container with professional styling
-        self._render_code_container(code, lines, known_problems)
+        self._render_code_container(code, known_problems)
          
     def _render_code_header(self, line_count: int, char_count: int, known_problems: List[str], instructor_mode: bool):
         """Render professional code header with metadata and controls."""
-        st.markdown(f"""
-        <div class="professional-code-header">
-            <div class="header-content">
-                <div>
-                    <h3>☕ {t('java_code_review_challenge')}</h3>
-                    <p>{t('review_code_below_instruction')}</p>
-                </div>
-                <div class="stats">
-                    <div class="stat-item">
-                        <div class="stat-value">{line_count}</div>
-                        <div class="stat-label">{t('lines')}</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">{char_count}</div>
-                        <div class="stat-label">{t('characters')}</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            _code_header_template(self.current_language).format(line_count=line_count, char_count=char_count),
+            unsafe_allow_html=True
+        )
     
-    def _render_code_container(self, code: str, lines: List[str], known_problems: List[str] = None):
+    def _render_code_container(self, code: str, known_problems: List[str] = None):
         """Render the main code container with enhanced styling."""
         
-        # Main code container with header
-        st.markdown(f"""
-        <div class="code-container">
-            <div class="code-header">
-                <span>📄 Main.java</span>
-                <span>☕ Java</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        # File caption above the code block
+        st.caption("📄 Main.java · ☕ Java")
         
         # FIXED: Better code formatting with validation
         display_code = self._ensure_proper_line_breaks(code)
@@ -215,7 +388,7 @@ class CodeDisplayUI:
         
         # Use Streamlit's native code display with line numbers
         try:
-            st.code(add_line_numbers(display_code), language="java")
+            st.code(_cached_numbered(display_code), language="java")
         except Exception as e:
             logger.error(f"Error displaying code with line numbers: {str(e)}")
             # Fallback to simple code display
@@ -234,18 +407,22 @@ class CodeDisplayUI:
         except:
             logger.error("Could not convert code to string")
             return ""
-        
+
+        # Fast path: code generated in-process is usually already normalized
+        if '\r' not in code_str and '\\n' not in code_str and '\n\n\n' not in code_str:
+            return code_str.strip()
+
         # Handle different types of line break representations
         # Replace literal \n with actual newlines if needed
         if '\\n' in code_str and '\n' not in code_str:
             code_str = code_str.replace('\\n', '\n')
         
-        # Handle \r\n (Windows) and \r (Mac) line endings
-        code_str = code_str.replace('\r\n', '\n').replace('\r', '\n')
+        # Handle \r\n (Windows) and \r (Mac) line endings in a single pass
+        if '\r' in code_str:
+            code_str = _CR_NL_RE.sub('\n', code_str)
         
         # Remove excessive empty lines (more than 2 consecutive)
-        import re
-        code_str = re.sub(r'\n{3,}', '\n\n', code_str)
+        code_str = _EXCESS_NL_RE.sub('\n\n', code_str)
         
         # Ensure code doesn't start or end with excessive whitespace
         code_str = code_str.strip()
@@ -288,19 +465,22 @@ class CodeDisplayUI:
     
     def _render_enhanced_review_header(self, iteration_count: int, max_iterations: int) -> None:
         """Render enhanced review header with better styling."""
-        progress_percentage = ((iteration_count - 1) / max_iterations) * 100
+        progress_percentage = _PROGRESS.get(
+            (iteration_count, max_iterations),
+            ((iteration_count - 1) / max_iterations) * 100
+        )
         
         st.markdown(f"""
         <div class="enhanced-review-header">
             <div class="progress-bar" style="width: {progress_percentage}%;"></div>
             <div class="header-content">
                 <div>
-                    <h3>📝 {t("submit_review_section")}</h3>
-                    <p>{t('provide_detailed_review')}</p>
+                    <h3>📝 {self._tr["submit_review_section"]}</h3>
+                    <p>{self._tr['provide_detailed_review']}</p>
                 </div>
                 <div class="iteration-indicator">
                     <div class="iteration-number">{iteration_count}</div>
-                    <div class="iteration-text">{t('of')} {max_iterations}</div>
+                    <div class="iteration-text">{self._tr['of']} {max_iterations}</div>
                 </div>
             </div>
         </div>
@@ -317,7 +497,7 @@ class CodeDisplayUI:
                 <div class="enhanced-guidance-section">
                     <div class="guidance-header">
                         <span class="guidance-icon">🎯</span>
-                        <h4>{t("review_guidance")}</h4>
+                        <h4>{self._tr["review_guidance"]}</h4>
                     </div>
                     <div class="guidance-content">
                         {targeted_guidance}
@@ -326,23 +506,23 @@ class CodeDisplayUI:
                 """, unsafe_allow_html=True)
                 
             if review_analysis:
-                identified_count = review_analysis.get(t("identified_count"), 0)
-                total_problems = review_analysis.get(t("total_problems"), 0)
-                percentage = review_analysis.get(t("identified_percentage"), 0)
+                identified_count = review_analysis.get(self._tr["identified_count"], 0)
+                total_problems = review_analysis.get(self._tr["total_problems"], 0)
+                percentage = review_analysis.get(self._tr["identified_percentage"], 0)
                     
                 st.markdown(f"""
                     <div class="analysis-section">
                         <div class="analysis-header">
                             <span class="analysis-icon">📊</span>
-                            <h4>{t("previous_results")}</h4>
+                            <h4>{self._tr["previous_results"]}</h4>
                         </div>
                         <div class="analysis-stats">
                             <div class="stat-row">
-                                <span>{t("issues_found")}:</span>
+                                <span>{self._tr["issues_found"]}:</span>
                                 <strong>{identified_count} / {total_problems}</strong>
                             </div>
                             <div class="stat-row">
-                                <span>{t("accuracy")}:</span>
+                                <span>{self._tr["accuracy"]}:</span>
                                 <strong>{percentage:.1f}%</strong>
                             </div>
                         </div>
@@ -352,69 +532,11 @@ class CodeDisplayUI:
     def _render_enhanced_review_guidelines(self) -> None:
         """Render enhanced review guidelines with better presentation."""
         
-        with st.expander(f"📋 {t('review_guidelines')}", expanded=False):
-            st.markdown(f"""
-            <div class="guidelines-section">
-                <h4>✨ {t('how_to_write_good_review')}</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Use columns for better layout
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown(f"""
-                **🎯 {t('be_specific')}**
-                
-                {t('point_out_exact_lines')}
-                """)
-                
-            with col2:
-                st.markdown(f"""
-                **🔍 {t('be_comprehensive')}**
-                
-                {t('check_all_aspects')}
-                """)
-                
-            with col3:
-                st.markdown(f"""
-                **💡 {t('be_constructive')}**
-                
-                {t('suggest_improvements')}
-                """)
-            
-            st.markdown(f"### 🔍 {t('what_to_check_for')}")
-            
-            # Use columns for check items
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown(f"""
-                **🔤 {t('syntax_compilation')}**
-                - {t('missing_semicolons')}
-                - {t('bracket_mismatches')}
-                - {t('type_errors')}
-                """)
-                
-            with col2:
-                st.markdown(f"""
-                **🐛 {t('logic_bugs')}**
-                - {t('array_bounds_issues')}
-                - {t('null_pointers')}
-                - {t('loop_conditions')}
-                """)
-                
-            with col3:
-                st.markdown(f"""
-                **⭐ {t('code_quality')}**
-                - {t('naming_conventions')}
-                - {t('code_formatting')}
-                - {t('documentation')}
-                """)
+        with st.expander(f"📋 {self._tr['review_guidelines']}", expanded=False):
+            st.markdown(_guidelines_html(self.current_language), unsafe_allow_html=True)
             
             # Example format
-            st.markdown(f"### 📝 {t('example_review_format')}")
-            st.code(t('review_format_example'), language="text")
+            st.code(self._tr['review_format_example'], language="text")
     
     def _render_review_form_fixed(self, iteration_count: int, on_submit_callback: Callable) -> bool:
         """
@@ -432,24 +554,24 @@ class CodeDisplayUI:
         # Form header
         st.markdown(f"""
         <div class="enhanced-input-section-header">
-            <h4>✍️ {t('your_review')} ({t('attempts')} {iteration_count})</h4>
-            <p>{t('write_comprehensive_review')}</p>
+            <h4>✍️ {self._tr['your_review']} ({self._tr['attempts']} {iteration_count})</h4>
+            <p>{self._tr['write_comprehensive_review']}</p>
         </div>
         """, unsafe_allow_html=True)
         
         # Review input
         student_review_input = st.text_area(
-            t("enter_your_review"),
+            self._tr["enter_your_review"],
             value="", 
             height=350,
             key=text_area_key,
-            placeholder=f"{t('review_format_example')}",
+            placeholder=f"{self._tr['review_format_example']}",
             label_visibility="collapsed"
         )
         
         
         submit_button = st.button(
-                f"🚀 {t('submit_review_button')} ({t('attempt')} {iteration_count})", 
+                f"🚀 {self._tr['submit_review_button']} ({self._tr['attempt']} {iteration_count})", 
                 type="primary", 
                 use_container_width=True,
                 key=submit_button_key
@@ -457,33 +579,31 @@ class CodeDisplayUI:
         
         # Handle submission
         if submit_button:
-            if not student_review_input or len(student_review_input.strip()) < 10:
+            # Length alone rules out short input; strip only when it cannot
+            cleaned_review = student_review_input.strip() if len(student_review_input) >= 10 else ""
+            if len(cleaned_review) < 10:
                 st.error("❌ Please provide a more detailed review")
                 return False
             
             # FIXED: Simple processing with fixed workflow
-            with st.spinner(f"🔄 {t('processing_your_review')}"):
+            with st.spinner(f"🔄 {self._tr['processing_your_review']}"):
                 user_id = st.session_state.auth.get("user_id")
                 if user_id:
-                    try:
-                        _log_user_interaction_code_display(
-                            user_id=user_id,
-                            interaction_category="practice", 
-                            interaction_type="submit_review",               
-                            details={
-                                "review_length": len(student_review_input),
-                                "iteration": iteration_count,
-                                "has_content": bool(student_review_input.strip())
-                            }
-                        )
-                    except Exception as log_error:
-                        logger.warning(f"Could not log interaction: {str(log_error)}")
-
-                result = on_submit_callback(student_review_input.strip())
+                    _submit_interaction_log(
+                        user_id=user_id,
+                        interaction_category="practice", 
+                        interaction_type="submit_review",               
+                        details={
+                            "review_length": len(student_review_input),
+                            "iteration": iteration_count,
+                            "has_content": bool(cleaned_review)
+                        }
+                    )
+
+                result = on_submit_callback(cleaned_review)
                 
                 if result:
-                    st.success(f"✅ {t('review_submitted_successfully')}")
-                    time.sleep(0.5)
+                    st.toast(f"✅ {self._tr['review_submitted_successfully']}")
                     st.rerun()
                     return True
                 else:
@@ -506,15 +626,18 @@ class CodeDisplayUI:
         """
         FIXED: Process review submission with comprehensive validation and error handling.
         """
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        session_state = st.session_state
         try:
-            logger.debug(f"Processing review submission for iteration {iteration_count}")
+            if debug_enabled:
+                logger.debug(f"Processing review submission for iteration {iteration_count}")
             
             # FIXED: Comprehensive input validation
             if not isinstance(review_text, str):
                 review_text = str(review_text) if review_text else ""
             
             if not review_text or not review_text.strip():
-                st.error(f"❌ {t('please_enter_review')}")
+                st.error(f"❌ {self._tr['please_enter_review']}")
                 self._safe_clear_processing_flag(processing_flag)
                 return False
             
@@ -522,13 +645,13 @@ class CodeDisplayUI:
             
             # FIXED: Enhanced validation
             if len(cleaned_review) < 20:
-                st.warning(t("review_too_short_warning"))
+                st.warning(self._tr["review_too_short_warning"])
                 self._safe_clear_processing_flag(processing_flag)
                 return False
             
             # Additional validation
             if len(cleaned_review.split()) < 5:
-                st.warning(f"{t('please_provide_at_least_5_words')}")
+                st.warning(f"{self._tr['please_provide_at_least_5_words']}")
                 self._safe_clear_processing_flag(processing_flag)
                 return False
             
@@ -539,13 +662,16 @@ class CodeDisplayUI:
                 return False
             
             # Show processing indicator
-            with st.spinner(f"🔄 {t('processing_review')}..."):
-                logger.debug(f"Calling submit callback with review: '{cleaned_review[:100]}...'")
+            with st.spinner(f"🔄 {self._tr['processing_review']}..."):
+                if debug_enabled:
+                    logger.debug(f"Calling submit callback with review: '{cleaned_review[:100]}...'")
                 
                 try:
-                    logger.debug("Executing callback function...")
+                    if debug_enabled:
+                        logger.debug("Executing callback function...")
                     result = on_submit_callback(cleaned_review)
-                    logger.debug(f"Callback returned: {result} (type: {type(result)})")
+                    if debug_enabled:
+                        logger.debug(f"Callback returned: {result} (type: {type(result)})")
                     
                     # Clear processing flag
                     self._safe_clear_processing_flag(processing_flag)
@@ -554,23 +680,23 @@ class CodeDisplayUI:
                     if result is True or result is None:
                         # Set success flag
                         try:
-                            st.session_state[success_flag] = True
+                            session_state[success_flag] = True
                         except Exception as flag_error:
                             logger.warning(f"Could not set success flag: {str(flag_error)}")
                         
                         # Clear the draft
                         try:
                             draft_key = f"review_draft_iter_{iteration_count}"
-                            if draft_key in st.session_state:
-                                del st.session_state[draft_key]
+                            if draft_key in session_state:
+                                del session_state[draft_key]
                         except Exception as draft_error:
                             logger.warning(f"Could not clear draft: {str(draft_error)}")
                         
-                        logger.debug(f"Review successfully submitted for iteration {iteration_count}")
+                        if debug_enabled:
+                            logger.debug(f"Review successfully submitted for iteration {iteration_count}")
                         
                         # FIXED: Safe rerun with error handling
                         try:
-                            time.sleep(0.5)  # Small delay to ensure state persistence
                             st.rerun()
                         except Exception as rerun_error:
                             logger.error(f"Error during rerun: {str(rerun_error)}")
@@ -578,19 +704,19 @@ class CodeDisplayUI:
                         return True
                     else:
                         logger.warning(f"Submit callback returned: {result} for iteration {iteration_count}")
-                        st.error(f"❌ {t('error')} {t('processing_review')}. Callback returned: {result}")
+                        st.error(f"❌ {self._tr['error']} {self._tr['processing_review']}. Callback returned: {result}")
                         return False
                         
                 except Exception as callback_error:
                     self._safe_clear_processing_flag(processing_flag)
                     logger.error(f"Exception in submit callback: {str(callback_error)}", exc_info=True)
-                    st.error(f"❌ {t('error')} {t('processing_review')}: {str(callback_error)}")
+                    st.error(f"❌ {self._tr['error']} {self._tr['processing_review']}: {str(callback_error)}")
                     return False
                     
         except Exception as e:
             self._safe_clear_processing_flag(processing_flag)
             logger.error(f"Exception in review submission processing: {str(e)}", exc_info=True)
-            st.error(f"❌ {t('error')} {t('processing_review')}: {str(e)}")
+            st.error(f"❌ {self._tr['error']} {self._tr['processing_review']}: {str(e)}")
             return False
 
 def render_review_tab(workflow, code_display_ui, auth_ui=None):
@@ -609,16 +735,18 @@ def render_review_tab(workflow, code_display_ui, auth_ui=None):
     """, unsafe_allow_html=True)
     
     # Simple state check
-    if not hasattr(st.session_state, 'workflow_state') or not st.session_state.workflow_state:
+    workflow_state = getattr(st.session_state, 'workflow_state', None)
+    if not workflow_state:
         st.info(f"📝 {t('please_generate_code_first')}")
         return
         
-    if not hasattr(st.session_state.workflow_state, 'code_snippet') or not st.session_state.workflow_state.code_snippet:
+    code_snippet = getattr(workflow_state, 'code_snippet', None)
+    if not code_snippet:
         st.info(f"⚙️ {t('please_generate_code_first')}")
         return
     
     # Display code
-    code_display_ui.render_code_display(st.session_state.workflow_state.code_snippet)
+    code_display_ui.render_code_display(code_snippet)
     
     # Handle review submission with fixed workflow
     _handle_review_submission_fixed(workflow, code_display_ui, auth_ui)
@@ -643,8 +771,9 @@ def _handle_review_submission_fixed(workflow, code_display_ui, auth_ui=None):
         # Simple callback for fixed workflow
         def on_submit_fixed(review_text):
             updated_state = workflow.submit_review(state, review_text)
-            if hasattr(updated_state, 'error') and updated_state.error:
-                st.error(f"❌ {updated_state.error}")
+            error = getattr(updated_state, 'error', None)
+            if error:
+                st.error(f"❌ {error}")
                 return False
             st.session_state.workflow_state = updated_state
             return True
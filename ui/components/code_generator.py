@@ -8,9 +8,10 @@ FIXED: Proper handling of LangGraph state objects (AddableValuesDict).
 
 import streamlit as st
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from data.database_error_repository import DatabaseErrorRepository
-from utils.language_utils import get_current_language, t
+from utils.language_utils import get_current_language, t, translate
 from state_schema import WorkflowState
 from utils.code_utils import _get_category_icon, _log_user_interaction_code_generator
 from utils.workflow_controller import workflow_controller
@@ -19,6 +20,149 @@ logger = logging.getLogger(__name__)
 import time
 
 
+# Generation parameters per internal user level
+_LEVEL_CONFIGS = {
+    "basic": {
+        "code_length": "short",
+        "difficulty": "easy",
+        "error_count_start": "1",
+        "error_count_end": "2"
+    },
+    "medium": {
+        "code_length": "medium", 
+        "difficulty": "medium",
+        "error_count_start": "2",
+        "error_count_end": "3"
+    },
+    "senior": {
+        "code_length": "long",
+        "difficulty": "hard", 
+        "error_count_start": "3",
+        "error_count_end": "5"
+    }
+}
+
+
+# Static UI strings rendered by CodeGeneratorUI
+_CODE_GENERATOR_TRANSLATION_KEYS = frozenset({
+    'all',
+    'basic',
+    'clear_all',
+    'code_length',
+    'complete_current_review_before_generating',
+    'current_generated_code',
+    'difficulty',
+    'easy',
+    'error_count',
+    'generate_a_new_code_snippet_with_the_same_configuration',
+    'generate_code_problem',
+    'generate_new',
+    'go_to_review_tab_to_continue',
+    'hard',
+    'long',
+    'medium',
+    'no_categories_available',
+    'not_satisfied_with_the_result',
+    'please_select_at_least_one_error_category',
+    'practice_with',
+    'previous_review_completed',
+    'random_mode_description',
+    'related_errors',
+    'remove_all_selected_categories',
+    'select',
+    'select_all_available_categories',
+    'select_error_categories',
+    'selected',
+    'senior',
+    'short',
+    'start_new_cycle',
+    'start_new_review_cycle',
+    'these_parameters_optimized',
+    'your_level',
+})
+
+
+@lru_cache(maxsize=4)
+def _ui_strings(language: str) -> Dict[str, str]:
+    """
+    Translate all CodeGeneratorUI render keys for a language in one pass.
+    
+    translate() is used because it never reads the process-wide locale
+    that other sessions keep switching.
+    """
+    return {key: translate(key, language) for key in _CODE_GENERATOR_TRANSLATION_KEYS}
+
+
+@lru_cache(maxsize=4)
+def _level_aliases(language: str) -> Dict[str, str]:
+    """
+    Map internal and localized (lowercased) level names to internal levels.
+    
+    Names come from translate() so the cached map always matches the
+    language argument, whatever locale other sessions have switched to.
+    """
+    aliases = {translate(level, language).lower(): level for level in _LEVEL_CONFIGS}
+    aliases.update((level, level) for level in _LEVEL_CONFIGS)
+    return aliases
+
+
+def _internal_level(user_level: str, language: str) -> str:
+    """Normalize an internal or localized user level, defaulting to medium."""
+    return _level_aliases(language).get(str(user_level).lower(), "medium")
+
+
+@st.cache_resource(show_spinner=False)
+def _get_db_repository(language: str) -> DatabaseErrorRepository:
+    """
+    Shared DatabaseErrorRepository for a UI language.
+    
+    The repository verifies the database schema when constructed, so it is
+    built once instead of on every rerun. It stores the current language on
+    itself while querying, so sessions share one instance per language
+    rather than one instance across languages.
+    """
+    return DatabaseErrorRepository()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_error_categories(language: str) -> Dict[str, List[str]]:
+    """
+    Load the error categories for a language from the database.
+    
+    Cached so category toggles and other reruns don't query the database.
+    The language argument is the cache key; the repository reads the
+    current language itself.
+    """
+    return _get_db_repository(language).get_all_categories()
+
+
+# Session key of the category multiselect; selected_categories mirrors its value
+_CATEGORY_WIDGET_KEY = "category_multiselect"
+
+
+def _set_selected_categories(categories: List[str]) -> None:
+    """Button callback: replace the selected categories."""
+    st.session_state.selected_categories = categories
+
+
+def _sync_selected_categories() -> None:
+    """Multiselect callback: copy the widget value and log what changed."""
+    previous = st.session_state.get("selected_categories", [])
+    current = list(st.session_state[_CATEGORY_WIDGET_KEY])
+    st.session_state.selected_categories = current
+    
+    user_id = st.session_state.auth.get("user_id") if "auth" in st.session_state else None
+    if user_id:
+        changes = [("select_category", category) for category in current if category not in previous]
+        changes += [("deselect_category", category) for category in previous if category not in current]
+        for interaction_type, category_name in changes:
+            _log_user_interaction_code_generator(
+                user_id=user_id,
+                interaction_category="practice",
+                interaction_type=interaction_type,               
+                details={"category": category_name}
+            )
+
 
 class CodeGeneratorUI:
     """
@@ -28,8 +172,9 @@ class CodeGeneratorUI:
     
     def __init__(self, workflow, code_display_ui):
         """Initialize the CodeGeneratorUI with database repository and workflow."""
-        self.db_repository = DatabaseErrorRepository()
         self.current_language = get_current_language()
+        self._tr = _ui_strings(self.current_language)
+        self.db_repository = _get_db_repository(self.current_language)
         self.workflow = workflow  # This is JavaCodeReviewGraph
         self.code_display_ui = code_display_ui
         
@@ -50,25 +195,25 @@ class CodeGeneratorUI:
         workflow_info = workflow_controller.get_workflow_state_info()
         
         if not workflow_info["can_generate"]:
-            st.warning("🔒 " + t("complete_current_review_before_generating"))
-            st.info("📋 " + t("go_to_review_tab_to_continue"))
+            st.warning("🔒 " + self._tr["complete_current_review_before_generating"])
+            st.info("📋 " + self._tr["go_to_review_tab_to_continue"])
             
             # Show current code if available
             if workflow_info["has_code"] and hasattr(st.session_state.workflow_state, 'code_snippet'):
-                st.markdown("### " + t("current_generated_code"))
+                st.markdown("### " + self._tr["current_generated_code"])
                 self.code_display_ui.render_code_display(st.session_state.workflow_state.code_snippet)
             
             return
         
         # Show workflow reset option if review is complete
         if workflow_info["review_complete"]:
-            st.success("🎉 " + t("previous_review_completed"))
+            st.success("🎉 " + self._tr["previous_review_completed"])
             
             col1, col2 = st.columns([2, 1])
             with col1:
-                st.info("💡 " + t("start_new_review_cycle"))
+                st.info("💡 " + self._tr["start_new_review_cycle"])
             with col2:
-                if st.button("🔄 " + t("start_new_cycle"), type="primary"):
+                if st.button("🔄 " + self._tr["start_new_cycle"], type="primary"):
                     workflow_controller.reset_workflow_for_new_cycle()
                     st.rerun()
         
@@ -118,17 +263,24 @@ class CodeGeneratorUI:
                 # Regenerate option
                 st.markdown(f"""
                 <div class="regenerate-section">
-                    <h4>🔄 {t('not_satisfied_with_the_result')}</h4>
-                    <p>{t('generate_a_new_code_snippet_with_the_same_configuration')}</p>
+                    <h4>🔄 {self._tr['not_satisfied_with_the_result']}</h4>
+                    <p>{self._tr['generate_a_new_code_snippet_with_the_same_configuration']}</p>
                 </div>
                 """, unsafe_allow_html=True)
                 
                 # FIXED: Remove on_click callback
-                if st.button(f"🔄 {t('generate_new')}", key="regenerate", use_container_width=True):
+                if st.button(f"🔄 {self._tr['generate_new']}", key="regenerate", use_container_width=True):
                     self._handle_code_generation_with_tracking()
 
+    @st.fragment
     def _render_configuration_section(self, user_level: str):
-        """Render the configuration section with category selection only."""
+        """
+        Render the configuration section with category selection only.
+        
+        Runs as a fragment so category changes rerun only this section. A
+        successful generation calls st.rerun(), which reruns the whole app
+        to switch to the review tab.
+        """
         
         # Parameters display
         self._render_parameters_display(user_level)
@@ -142,7 +294,7 @@ class CodeGeneratorUI:
         """Render the category selection interface without mode tabs."""
         st.markdown(f"""
         <div class="mode-description">
-            <p>🎲 {t('random_mode_description')}</p>
+            <p>🎲 {self._tr['random_mode_description']}</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -164,7 +316,7 @@ class CodeGeneratorUI:
         
         
         if st.button(
-            f"🔧 {t('generate_code_problem')}",
+            f"🔧 {self._tr['generate_code_problem']}",
             key="generate_code_main",
             type="primary",
             use_container_width=True,
@@ -176,37 +328,25 @@ class CodeGeneratorUI:
         # st.markdown('</div>', unsafe_allow_html=True)
         
         if not selected_categories:
-            st.warning(f"⚠️ {t('please_select_at_least_one_error_category')}")
+            st.warning(f"⚠️ {self._tr['please_select_at_least_one_error_category']}")
 
     def _render_parameters_display(self, user_level: str):
         """Render the parameters display with visual cards, supporting both English and Chinese."""
-        # Always use the canonical user_level key for lookup (internal: 'basic', 'medium', 'senior')
-        # Accept both English and localized user_level
-        internal_levels = ["basic", "medium", "senior"]
-        localized_levels = [t("basic"), t("medium"), t("senior")]
-        # Map user_level to internal if possible
-        user_level_key = user_level.lower()
-        
-        if user_level_key in internal_levels:
-            internal_level = user_level_key
-        elif user_level_key in localized_levels:
-            internal_level = internal_levels[localized_levels.index(user_level_key)]
-        else:
-            internal_level = "medium"
-
-        params = self._get_level_parameters(user_level)
+        # Accept both English and localized user_level; look up by the internal key
+        internal_level = _internal_level(user_level, self.current_language)
+        params = _LEVEL_CONFIGS[internal_level]
         
         # Localize code_length and difficulty values
         code_length_localized = {
-            "short": t("short"),
-            "medium": t("medium"),
-            "long": t("long")
+            "short": self._tr["short"],
+            "medium": self._tr["medium"],
+            "long": self._tr["long"]
         }.get(params['code_length'], params['code_length'])
 
         difficulty_localized = {
-            "easy": t("easy"),
-            "medium": t("medium"),
-            "hard": t("hard")
+            "easy": self._tr["easy"],
+            "medium": self._tr["medium"],
+            "hard": self._tr["hard"]
         }.get(params['difficulty'], params['difficulty'])
 
         # Display parameters in a grid
@@ -215,7 +355,7 @@ class CodeGeneratorUI:
             st.markdown(f"""
             <div class="parameter-card">
                 <span class="parameter-icon">📏</span>
-                <div class="parameter-label">{t('code_length')}</div>
+                <div class="parameter-label">{self._tr['code_length']}</div>
                 <div class="parameter-value">{code_length_localized}</div>
             </div>
             """, unsafe_allow_html=True)
@@ -223,7 +363,7 @@ class CodeGeneratorUI:
             st.markdown(f"""
             <div class="parameter-card">
                 <span class="parameter-icon">⭐</span>
-                <div class="parameter-label">{t('difficulty')}</div>
+                <div class="parameter-label">{self._tr['difficulty']}</div>
                 <div class="parameter-value">{difficulty_localized}</div>
             </div>
             """, unsafe_allow_html=True)
@@ -231,7 +371,7 @@ class CodeGeneratorUI:
             st.markdown(f"""
             <div class="parameter-card">
                 <span class="parameter-icon">🐛</span>
-                <div class="parameter-label">{t('error_count')}</div>
+                <div class="parameter-label">{self._tr['error_count']}</div>
                 <div class="parameter-value">{params['error_count_start']} - {params['error_count_end']}</div>
             </div>
             """, unsafe_allow_html=True)
@@ -239,13 +379,13 @@ class CodeGeneratorUI:
             st.markdown(f"""
             <div class="parameter-card">
                 <span class="parameter-icon">👤</span>
-                <div class="parameter-label">{t('your_level')}</div>
-                <div class="parameter-value">{t(user_level_key) if user_level_key in localized_levels else t(internal_level)}</div>
+                <div class="parameter-label">{self._tr['your_level']}</div>
+                <div class="parameter-value">{self._tr[internal_level]}</div>
             </div>
             """, unsafe_allow_html=True)
         st.markdown(f"""
         <div class="parameters-note">
-            💡 {t('these_parameters_optimized')}
+            💡 {self._tr['these_parameters_optimized']}
         </div>
         """, unsafe_allow_html=True)
 
@@ -264,101 +404,77 @@ class CodeGeneratorUI:
         if java_categories:
             self._render_category_grid(java_categories)
         else:
-            st.warning(t("no_categories_available"))
+            st.warning(self._tr["no_categories_available"])
 
-    def _toggle_category(self, category_name: str):
-        """Toggle category selection without triggering rerun."""
-        
-        user_id = st.session_state.auth.get("user_id") if "auth" in st.session_state else None
-        if user_id:
-            interaction_type = "select_category" if category_name not in st.session_state.get("selected_categories", []) else "deselect_category"
-            _log_user_interaction_code_generator(
-                user_id=user_id,
-                interaction_category="practice",
-                interaction_type=interaction_type,               
-                details={"category": category_name}
-            )
-            
-        # Ensure selected_categories is initialized as a list
-        if "selected_categories" not in st.session_state:
-            st.session_state.selected_categories = []
-        
-        # Ensure it's always a list
-        if not isinstance(st.session_state.selected_categories, list):
-            st.session_state.selected_categories = []
-        
-        if category_name in st.session_state.selected_categories:
-            st.session_state.selected_categories.remove(category_name)
-        else:
-            st.session_state.selected_categories.append(category_name)
-        
     def _render_category_grid(self, categories: List[str]):
-        """Render categories in a compact three-column layout with parameter card styling."""
-        # Ensure selected_categories is a list
+        """Render the category cards as one HTML grid with a multiselect for choosing them."""
+        # Ensure selected_categories is a list of currently available categories
         selected = st.session_state.get("selected_categories", [])
         if not isinstance(selected, list):
             selected = []
-            st.session_state.selected_categories = []
-        
-        # Three-column grid for better space utilization
-        cols = st.columns(3, gap="medium")
-        
-        # Distribute categories across three columns
-        for i, category_name in enumerate(categories):
-            description = f"{t('practice_with')} {category_name} {t('related_errors')}"
-            icon = _get_category_icon(category_name)
-            is_selected = category_name in selected
-            
-            # Current column (cycle through 0, 1, 2)
-            current_col = cols[i % 3]
-            
-            with current_col:
-                # Parameter card style with selection state
-                selected_class = "selected" if is_selected else ""
-                selection_indicator = f"✓ {t('selected')}" if is_selected else f"{t('click_to_select')}"
-
-                st.markdown(f"""
-                <div class="parameter-card category-card {selected_class}">
-                    <span class="parameter-icon">{icon}</span>
-                    <div class="parameter-label">{category_name}</div>
-                </div>
-                """, unsafe_allow_html=True)
-               
-                # FIXED: Remove st.rerun() from button callback
-                if st.button(
-                    selection_indicator,
-                    key=f"category_card_{category_name}",
-                    help=description,
-                    use_container_width=True
-                ):
-                    self._toggle_category(category_name)
-                    # FIXED: Remove st.rerun() call
-        
-        # Compact quick actions optimized for 3-column layout
+        available = set(categories)
+        if any(category not in available for category in selected):
+            selected = [category for category in selected if category in available]
+        st.session_state.selected_categories = selected
+        
+        # Labels shared by every card, looked up once per render
+        tr = self._tr
+        practice_with, related_errors = tr['practice_with'], tr['related_errors']
+        selected_label = f"✓ {tr['selected']}"
+        selected_set = set(selected)
+        
+        cards = []
+        for category_name in categories:
+            if category_name in selected_set:
+                card_class = "parameter-card category-card selected"
+                indicator = f'<div class="category-selected">{selected_label}</div>'
+            else:
+                card_class = "parameter-card category-card"
+                indicator = ""
+            cards.append(
+                f'<div class="{card_class}" title="{practice_with} {category_name} {related_errors}">'
+                f'<span class="parameter-icon">{_get_category_icon(category_name)}</span>'
+                f'<div class="parameter-label">{category_name}</div>'
+                f'{indicator}</div>'
+            )
+        st.markdown(f'<div class="category-grid">{"".join(cards)}</div>', unsafe_allow_html=True)
+        
+        # The widget has its own key so selected_categories survives reruns that skip this grid
+        st.session_state[_CATEGORY_WIDGET_KEY] = list(selected)
+        st.multiselect(
+            tr['select_error_categories'],
+            options=categories,
+            key=_CATEGORY_WIDGET_KEY,
+            on_change=_sync_selected_categories,
+            format_func=lambda category: f"{_get_category_icon(category)} {category}",
+            label_visibility="collapsed"
+        )
+        
+        # Compact quick actions
         if categories and len(categories) > 1:
             col1, col2 = st.columns(2)
             
             with col1:
-                if st.button(
-                    f"🎯 {t('select')} {t('all')}",
+                st.button(
+                    f"🎯 {tr['select']} {tr['all']}",
                     key="select_all_categories",
-                    help=f"{t('select_all_available_categories')}",
+                    help=f"{tr['select_all_available_categories']}",
                     use_container_width=True,
-                    disabled=len(selected) == len(categories)
-                ):
-                    st.session_state.selected_categories = categories.copy()
-                    # FIXED: Remove st.rerun() call
+                    disabled=len(selected) == len(categories),
+                    on_click=_set_selected_categories,
+                    args=(list(categories),)
+                )
             
             with col2:
-                if st.button(
-                    f"🗑️ {t('clear_all')}",
+                st.button(
+                    f"🗑️ {tr['clear_all']}",
                     key="clear_all_categories", 
-                    help=f"{t('remove_all_selected_categories')}",
+                    help=f"{tr['remove_all_selected_categories']}",
                     use_container_width=True,
-                    disabled=len(selected) == 0
-                ):
-                    st.session_state.selected_categories = []
-                    # FIXED: Remove st.rerun() call
+                    disabled=len(selected) == 0,
+                    on_click=_set_selected_categories,
+                    args=([],)
+                )
 
     def _can_generate(self) -> bool:
         """Check if we can generate code based on selected categories."""
@@ -367,28 +483,7 @@ class CodeGeneratorUI:
 
     def _get_level_parameters(self, user_level: str) -> Dict[str, Any]:
         """Get parameters based on user level."""
-
-        level_configs = {
-            f"{t('basic').lower()}": {
-                "code_length": "short",
-                "difficulty": "easy",
-                "error_count_start": "1",
-                "error_count_end": "2"
-            },
-            f"{t('medium').lower()}": {
-                "code_length": "medium", 
-                "difficulty": "medium",
-                "error_count_start": "2",
-                "error_count_end": "3"
-            },
-            f"{t('senior').lower()}": {
-                "code_length": "long",
-                "difficulty": "hard", 
-                "error_count_start": "3",
-                "error_count_end": "5"
-            }
-        }
-        return level_configs.get(user_level.lower(), level_configs[f"{t('medium').lower()}"])
+        return _LEVEL_CONFIGS[_internal_level(user_level, self.current_language)]
 
     def _render_header(self):
         """Render the professional header with branding and description."""
@@ -402,10 +497,15 @@ class CodeGeneratorUI:
     def _get_error_categories(self) -> Dict[str, List[str]]:
         """Get all available error categories."""
         try:      
-            return self.db_repository.get_all_categories() 
+            categories = _load_error_categories(self.current_language)
         except Exception as e:
             logger.error(f"Error getting categories: {str(e)}")
             return {"java_errors": []}
+        
+        # The repository reports DB failures as an empty result; don't keep that cached
+        if not categories.get("java_errors"):
+            _load_error_categories.clear()
+        return categories
     
     def _prepare_workflow_state(self) -> Optional[WorkflowState]:
         """
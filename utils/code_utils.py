@@ -797,13 +797,24 @@ def _get_difficulty_icon(difficulty_name: str) -> str:
         # Default fallback icon
     return "🐛"
 
+def _code_display_interaction_context() -> Dict[str, Any]:
+    """Snapshot the workflow context recorded with code display interactions."""
+    return {            
+        "current_step": getattr(st.session_state.get("workflow_state"), 'current_step', 'unknown') if hasattr(st.session_state, 'workflow_state') else 'unknown',
+        "current_iteration": getattr(st.session_state.get("workflow_state"), 'current_iteration', 0) if hasattr(st.session_state, 'workflow_state') else 0,
+        "has_code_snippet": hasattr(st.session_state.get("workflow_state"), 'code_snippet') if hasattr(st.session_state, 'workflow_state') else False,
+        "language": get_current_language(),
+        "timestamp": time.time()
+    }
+
 def _log_user_interaction_code_display( 
                          user_id: str,
                          interaction_category: str,
                          interaction_type: str,                        
                          success: bool = True,                        
                          details: Dict[str, Any] = None,
-                         time_spent_seconds: int = None) -> None:
+                         time_spent_seconds: int = None,
+                         context_data: Dict[str, Any] = None) -> None:
     """
     Centralized method to log all user interactions to the database.
     
@@ -814,6 +825,7 @@ def _log_user_interaction_code_display(
         success: Whether the action was successful       
         details: Additional details about the interaction
         time_spent_seconds: Time spent on this interaction
+        context_data: Context from _code_display_interaction_context(), taken now if omitted
     """
     try:
         if not user_id:
@@ -821,13 +833,8 @@ def _log_user_interaction_code_display(
         
         
         # Prepare context data
-        context_data = {            
-            "current_step": getattr(st.session_state.get("workflow_state"), 'current_step', 'unknown') if hasattr(st.session_state, 'workflow_state') else 'unknown',
-            "current_iteration": getattr(st.session_state.get("workflow_state"), 'current_iteration', 0) if hasattr(st.session_state, 'workflow_state') else 0,
-            "has_code_snippet": hasattr(st.session_state.get("workflow_state"), 'code_snippet') if hasattr(st.session_state, 'workflow_state') else False,
-            "language": get_current_language(),
-            "timestamp": time.time()
-        }
+        if context_data is None:
+            context_data = _code_display_interaction_context()
         
         # Log through behavior tracker
         behavior_tracker.log_interaction(
@@ -104,6 +104,22 @@ def t(key: str, **kwargs) -> str:
     
     return i18n_t(key, **kwargs)
 
+def translate(key: str, language: str, **kwargs) -> str:
+    """
+    Translate a text key into a specific language without changing the current one.
+    
+    Args:
+        key: Text key to translate
+        language: Language code ('en' or 'zh')
+        **kwargs: Variables for string formatting
+        
+    Returns:
+        Translated text
+    """
+    _ensure_i18n_initialized()
+    
+    return get_i18n().translate(key, locale=language, **kwargs)
+
 def get_translations(language: str = None) -> Dict[str, str]:
     """
     Get translations for the specified language.
@@ -191,6 +207,7 @@ __all__ = [
     'set_language', 
     'get_current_language',
     't',
+    'translate',
     'get_translations',
     'get_llm_prompt_instructions',
     'render_language_selector',
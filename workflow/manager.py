@@ -6,10 +6,11 @@ code regeneration during review submissions.
 """
 
 import logging
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple
 
 from langgraph.graph import StateGraph
-from state_schema import WorkflowState, ReviewAttempt, CodeSnippet
+from state_schema import WorkflowState, ReviewAttempt, CodeSnippet, tick_state_clock, state_clock
 
 from data.database_error_repository import DatabaseErrorRepository
 
@@ -136,7 +137,7 @@ class WorkflowManager:
             logger.debug("Starting code generation workflow")
             
             # Set initial step
-            workflow_state.current_step = "generate"
+            workflow_state.fast_update(current_step="generate", last_update_timestamp=tick_state_clock())
             # Ensure max attempts are set to prevent infinite loops
             if not hasattr(workflow_state, 'max_evaluation_attempts') or int(workflow_state.max_evaluation_attempts) <= 0:
                 workflow_state.max_evaluation_attempts = 3
@@ -173,6 +174,7 @@ class WorkflowManager:
                 logger.error(f"Code generation workflow returned error: {result.error}")
             else:
                 logger.debug("Code generation workflow completed successfully")
+                result.mark_phase(phase="code_generation", ts=tick_state_clock())
                 
             return result
             
@@ -191,6 +193,9 @@ class WorkflowManager:
             logger.debug(f"Student review length: {len(student_review)}")
             
             # Set the pending review for processing
+            workflow_state.last_update_timestamp = tick_state_clock()
+            if workflow_state.review_phase_started is None:
+                workflow_state.mark_phase(phase="review")
             workflow_state.pending_review = student_review.strip()
             workflow_state.current_step = "review"
             
@@ -392,8 +397,8 @@ class WorkflowManager:
             if not value:
                 return []
             
-            if not isinstance(value, list):
-                logger.warning(f"Expected list for review_history, got {type(value)}")
+            if not isinstance(value, (list, deque)):
+                logger.warning(f"Expected list or deque for review_history, got {type(value)}")
                 return []
             
             clean_history = []
@@ -493,7 +498,14 @@ class WorkflowManager:
                 # Final output
                 'comparison_report': None,
                 'error': None,
-                'final_summary': None
+                'final_summary': None,
+                
+                # Phase flags and timestamps set by mark_phase
+                'workflow_completed': False,
+                'code_generation_completed': False,
+                'review_phase_started': None,
+                'code_generation_timestamp': None,
+                'last_update_timestamp': None
             }
             
             # Extract each field systematically
@@ -524,7 +536,13 @@ class WorkflowManager:
                         state_dict[field_name] = int(extracted_value) if extracted_value is not None else default_value
                     except (ValueError, TypeError):
                         state_dict[field_name] = default_value
-                elif field_name == 'review_sufficient':
+                elif field_name in ['review_phase_started', 'code_generation_timestamp', 'last_update_timestamp']:
+                    # Keep recorded timestamps; a per-step copy without one shares the step's clock sample
+                    if extracted_value is not None:
+                        state_dict[field_name] = extracted_value
+                    elif field_name == 'last_update_timestamp':
+                        state_dict[field_name] = state_clock()
+                elif field_name in ['review_sufficient', 'workflow_completed', 'code_generation_completed']:
                     # Ensure boolean
                     try:
                         state_dict[field_name] = bool(extracted_value) if extracted_value is not None else default_value
@@ -10,7 +10,7 @@ import logging
 import re
 from typing import Dict, Any, List, Tuple, Optional
 
-from state_schema import WorkflowState, CodeSnippet, ReviewAttempt
+from state_schema import WorkflowState, CodeSnippet
 from utils.code_utils import extract_both_code_versions, create_regeneration_prompt
 from utils.language_utils import t
 import random
@@ -343,14 +343,11 @@ class WorkflowNodes:
                     break
             
             if needs_new_entry:
-                # Create new review entry
-                review_attempt = ReviewAttempt(
+                # Create new review entry in the bounded history
+                state.append_attempt(
                     student_review=review_text,
-                    iteration_number=current_iteration,
-                    analysis={},
-                    targeted_guidance=None
+                    iteration_number=current_iteration
                 )
-                state.review_history.append(review_attempt)
                 logger.debug(f"Created new review entry for iteration {current_iteration}")
             
             # Clear pending review